@@ -266,17 +266,29 @@ class BacktestingService:
         position = None  # Current open position
         strategy_state = {}  # State for stateful strategies (like ORB)
         
+        # Bar-local strategies get every candle's signal in one vectorized pass
+        batch = self._batch_signals(df, strategy_type, strategy_params)
+        
         for i in range(len(df)):
             row = df.iloc[i]
             
             # Generate signal based on strategy
-            signal = self._generate_signal(
-                df=df,
-                index=i,
-                strategy_type=strategy_type,
-                strategy_params=strategy_params,
-                state=strategy_state
-            )
+            if batch is not None:
+                actions, stops, targets = batch
+                action = actions[i]
+                signal = {
+                    'action': 'BUY' if action > 0 else 'SELL',
+                    'stop_loss': stops[i],
+                    'target': targets[i]
+                } if action else None
+            else:
+                signal = self._generate_signal(
+                    df=df,
+                    index=i,
+                    strategy_type=strategy_type,
+                    strategy_params=strategy_params,
+                    state=strategy_state
+                )
             
             # Execute trades based on signal
             if signal and position is None:
@@ -414,6 +426,81 @@ class BacktestingService:
         
         return None
     
+    def _batch_signals(
+        self,
+        df: pd.DataFrame,
+        strategy_type: str,
+        strategy_params: Dict
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Signals for every candle at once, for strategies that only compare
+        a candle with the previous one
+        
+        Applies the same rules as the matching _*_signal method to whole
+        indicator columns instead of looping row by row.
+        
+        Returns:
+            (action, stop_loss, target) arrays, action being 1 for BUY,
+            -1 for SELL and 0 for none; None if the strategy needs the
+            per-candle path (stateful or pattern based)
+        """
+        def col(name):
+            return df[name].to_numpy(dtype=np.float64)
+        
+        def prev(a):
+            return np.concatenate(([np.nan], a[:-1]))
+        
+        close = col('close')
+        
+        if strategy_type == 'supertrend':
+            st = col('supertrend')
+            prev_close, prev_st = prev(close), prev(st)
+            buy = (prev_close < prev_st) & (close > st)
+            sell = (prev_close > prev_st) & (close < st)
+            buy_levels = (st, close + (close - st) * 2)
+            sell_levels = (st, close - (st - close) * 2)
+        
+        elif strategy_type == 'ema_rsi':
+            fast, slow, rsi = col('ema_9'), col('ema_21'), col('rsi')
+            prev_fast, prev_slow = prev(fast), prev(slow)
+            buy = (prev_fast < prev_slow) & (fast > slow) & (rsi > 50)
+            sell = (prev_fast > prev_slow) & (fast < slow) & (rsi < 50)
+            buy_levels = (close * 0.98, close * 1.04)
+            sell_levels = (close * 1.02, close * 0.96)
+        
+        elif strategy_type == 'renko_macd':
+            macd, signal = col('macd'), col('macd_signal')
+            prev_macd, prev_signal = prev(macd), prev(signal)
+            buy = (prev_macd < prev_signal) & (macd > signal) & (macd < 0)
+            sell = (prev_macd > prev_signal) & (macd < signal) & (macd > 0)
+            buy_levels = (close * 0.97, close * 1.05)
+            sell_levels = (close * 1.03, close * 0.95)
+        
+        elif strategy_type == 'ema_scalping':
+            sl_pct = float(strategy_params.get('sl_pct', 0.005))
+            target_pct = float(strategy_params.get('target_pct', 0.01))
+            fast = col('ema_fast' if 'ema_fast' in df.columns else 'ema_9')
+            slow = col('ema_slow' if 'ema_slow' in df.columns else 'ema_21')
+            prev_fast, prev_slow = prev(fast), prev(slow)
+            buy = (prev_fast <= prev_slow) & (fast > slow)
+            sell = (prev_fast >= prev_slow) & (fast < slow)
+            buy_levels = (close * (1 - sl_pct), close * (1 + target_pct))
+            sell_levels = (close * (1 + sl_pct), close * (1 - target_pct))
+        
+        else:
+            return None
+        
+        # Same warm-up as _generate_signal; BUY wins ties as it is checked first
+        buy[:50] = False
+        sell[:50] = False
+        sell &= ~buy
+        
+        action = buy.astype(np.int8) - sell.astype(np.int8)
+        stop_loss = np.where(buy, buy_levels[0], sell_levels[0])
+        target = np.where(buy, buy_levels[1], sell_levels[1])
+        
+        return action, stop_loss, target
+    
     def _supertrend_signal(self, row, prev_row, params: Dict) -> Optional[Dict]:
         """Supertrend strategy signal"""
         # Buy signal: Price crosses above supertrend
@@ -9,6 +9,53 @@ import pandas as pd
 import numpy as np
 from typing import Optional, Tuple
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _supertrend_loop(close, upper_band, lower_band, period: int, out) -> None:
+    """
+    Supertrend recursion, written into out from index period onwards
+    
+    Each value depends on the previous one, so this stays a scalar loop;
+    max/min are spelled out to keep Python's NaN ordering.
+    """
+    n = len(close)
+    if n <= period:
+        return
+    
+    out[period] = lower_band[period]
+    uptrend = True
+    
+    for i in range(period + 1, n):
+        prev = out[i - 1]
+        if uptrend:
+            if close[i] <= prev:
+                out[i] = upper_band[i]
+                uptrend = False
+            else:
+                band = lower_band[i]
+                out[i] = prev if prev > band else band
+        else:
+            if close[i] >= prev:
+                out[i] = lower_band[i]
+                uptrend = True
+            else:
+                band = upper_band[i]
+                out[i] = prev if prev < band else band
+
+
+# Compiled when numba is installed (eagerly, so the first tick pays no JIT);
+# the plain loop runs over lists otherwise
+if NUMBA_AVAILABLE:
+    _supertrend_loop = njit(
+        "void(float64[:], float64[:], float64[:], int64, float64[:])",
+        cache=True
+    )(_supertrend_loop)
+
 
 class TechnicalIndicators:
     """
@@ -260,6 +307,30 @@ class TechnicalIndicators:
     
     # ==================== ATR ====================
     
+    @staticmethod
+    def true_range(df: pd.DataFrame) -> np.ndarray:
+        """
+        True Range: max(high - low, |high - prev close|, |low - prev close|)
+        
+        Shared by atr, atr_last, adx and the supertrend strategy, so the
+        same bars are never reduced twice per caller.
+        
+        Args:
+            df: DataFrame with 'high', 'low', 'close' columns
+            
+        Returns:
+            True range per bar (the first bar is just high - low)
+        """
+        high = df['high'].to_numpy(dtype=float)
+        low = df['low'].to_numpy(dtype=float)
+        close = df['close'].to_numpy(dtype=float)
+        
+        # First bar has no previous close; fmax skips the NaN
+        prev_close = np.empty_like(close)
+        prev_close[:1] = np.nan
+        prev_close[1:] = close[:-1]
+        return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    
     @staticmethod
     def atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
         """
@@ -272,18 +343,77 @@ class TechnicalIndicators:
         Returns:
             ATR series
         """
-        # True Range calculation
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+        true_range = pd.Series(TechnicalIndicators.true_range(df), index=df.index)
         
         # ATR is EMA of True Range
         atr = true_range.ewm(alpha=1/period, adjust=False).mean()
         
         return atr
     
+    @staticmethod
+    def atr_last(df: pd.DataFrame, period: int = 14) -> float:
+        """
+        Latest ATR value only
+        
+        Same result as atr(df, period).iloc[-1], without building an
+        indexed series.
+        
+        Args:
+            df: DataFrame with 'high', 'low', 'close' columns
+            period: ATR period (default: 14)
+            
+        Returns:
+            Last ATR value
+        """
+        true_range = TechnicalIndicators.true_range(df)
+        return float(pd.Series(true_range).ewm(alpha=1/period, adjust=False).mean().iat[-1])
+    
+    # ==================== ADX ====================
+    
+    @staticmethod
+    def adx(df: pd.DataFrame, period: int = 14) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        """
+        Average Directional Index (trend strength) with Wilder's smoothing
+        
+        Directional movement and true range are computed on raw numpy
+        arrays in one pass; only the smoothing goes through ewm.
+        
+        Args:
+            df: DataFrame with 'high', 'low', 'close' columns
+            period: ADX period (default: 14)
+            
+        Returns:
+            (adx, plus_di, minus_di) series
+        """
+        high = df['high'].to_numpy(dtype=float)
+        low = df['low'].to_numpy(dtype=float)
+        
+        # Directional movement
+        up = np.empty_like(high)
+        down = np.empty_like(low)
+        up[0] = down[0] = 0.0
+        up[1:] = high[1:] - high[:-1]
+        down[1:] = low[:-1] - low[1:]
+        
+        plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+        minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+        
+        # True Range
+        true_range = TechnicalIndicators.true_range(df)
+        
+        # Wilder's smoothing
+        smoothed = pd.DataFrame(
+            {'tr': true_range, 'plus': plus_dm, 'minus': minus_dm}, index=df.index
+        ).ewm(alpha=1/period, adjust=False).mean()
+        
+        plus_di = 100 * smoothed['plus'] / smoothed['tr']
+        minus_di = 100 * smoothed['minus'] / smoothed['tr']
+        
+        dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
+        adx = dx.ewm(alpha=1/period, adjust=False).mean()
+        
+        return adx, plus_di, minus_di
+    
     @staticmethod
     def supertrend(
         df: pd.DataFrame,
@@ -302,38 +432,25 @@ class TechnicalIndicators:
             Supertrend series
         """
         # Calculate ATR
-        atr = TechnicalIndicators.atr(df, period)
+        atr = TechnicalIndicators.atr(df, period).to_numpy(dtype=np.float64)
         
         # Basic upper and lower bands
-        hl_avg = (df['high'] + df['low']) / 2
+        hl_avg = (
+            df['high'].to_numpy(dtype=np.float64) + df['low'].to_numpy(dtype=np.float64)
+        ) / 2
         upper_band = hl_avg + (multiplier * atr)
         lower_band = hl_avg - (multiplier * atr)
+        close = df['close'].to_numpy(dtype=np.float64)
         
-        # Initialize
-        supertrend = pd.Series(index=df.index, dtype=float)
-        direction = pd.Series(index=df.index, dtype=int)
+        # Band-following recursion (see _supertrend_loop)
+        if NUMBA_AVAILABLE:
+            values = np.full(len(df), np.nan)
+            _supertrend_loop(close, upper_band, lower_band, period, values)
+        else:
+            values = [np.nan] * len(df)
+            _supertrend_loop(close.tolist(), upper_band.tolist(), lower_band.tolist(), period, values)
         
-        for i in range(period, len(df)):
-            if i == period:
-                supertrend.iloc[i] = lower_band.iloc[i]
-                direction.iloc[i] = 1
-            else:
-                # Uptrend
-                if direction.iloc[i-1] == 1:
-                    if df['close'].iloc[i] <= supertrend.iloc[i-1]:
-                        supertrend.iloc[i] = upper_band.iloc[i]
-                        direction.iloc[i] = -1
-                    else:
-                        supertrend.iloc[i] = max(lower_band.iloc[i], supertrend.iloc[i-1])
-                        direction.iloc[i] = 1
-                # Downtrend
-                else:
-                    if df['close'].iloc[i] >= supertrend.iloc[i-1]:
-                        supertrend.iloc[i] = lower_band.iloc[i]
-                        direction.iloc[i] = 1
-                    else:
-                        supertrend.iloc[i] = min(upper_band.iloc[i], supertrend.iloc[i-1])
-                        direction.iloc[i] = -1
+        supertrend = pd.Series(values, index=df.index, dtype=float)
         
         return supertrend
 
@@ -7,6 +7,7 @@ PAPER TRADING MODE: This service now supports paper trading to prevent real orde
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 from kiteconnect import KiteConnect
 from app.services.kite_auth import kite_auth_service
 from app.services.paper_trading import paper_engine, PAPER_TRADING_MODE
@@ -362,6 +363,46 @@ class OrderService:
         except Exception as e:
             raise Exception(f"Failed to place market order with SL: {str(e)}")
     
+    def place_basket_orders(
+        self,
+        orders: List[Dict],
+        max_workers: int = 10,
+        executor: Optional[Executor] = None
+    ) -> List[Dict]:
+        """
+        Place several market + stop-loss orders at once
+        
+        Kite Connect has no multi-order placement endpoint, so the orders
+        are sent concurrently; total latency is roughly one round-trip
+        per batch instead of one per order.
+        
+        Args:
+            orders: List of place_market_order_with_sl keyword-argument dicts
+            max_workers: Maximum concurrent order requests
+            executor: Existing executor to run on instead of a temporary pool
+            
+        Returns:
+            Results in the same order as `orders`. Failed orders get
+            {'success': False, 'message': ...} instead of raising.
+        """
+        if not orders:
+            return []
+        
+        def place(order: Dict) -> Dict:
+            try:
+                return self.place_market_order_with_sl(**order)
+            except Exception as e:
+                return {'success': False, 'message': str(e)}
+        
+        if len(orders) == 1:
+            return [place(orders[0])]
+        
+        if executor is not None:
+            return list(executor.map(place, orders))
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(orders))) as executor:
+            return list(executor.map(place, orders))
+    
     def place_bracket_order(
         self,
         tradingsymbol: str,
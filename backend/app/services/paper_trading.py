@@ -849,6 +849,39 @@ class PaperTradingEngine:
         if updated:
             self._save_meta() # PERSISTENCE
     
+    def update_ltps(self, exchange: str, ltps: Dict[str, float]):
+        """
+        Bulk version of update_ltp for many symbols on one exchange
+        
+        Walks the positions once and recalculates daily P&L once,
+        instead of once per symbol.
+        
+        Args:
+            exchange: Exchange name
+            ltps: {symbol: last_price}
+        """
+        if not ltps:
+            return
+        
+        for symbol, ltp in ltps.items():
+            self.ltp_cache[f"{exchange}:{symbol}"] = ltp
+        
+        updated = False
+        for position in self.positions.values():
+            if position.exchange != exchange:
+                continue
+            ltp = ltps.get(position.symbol)
+            if ltp is None:
+                continue
+            position.last_price = ltp
+            self._calculate_pnl(position)
+            self._save_position(position) # PERSISTENCE
+            updated = True
+        
+        self._update_daily_pnl()
+        if updated:
+            self._save_meta() # PERSISTENCE
+    
     def _update_daily_pnl(self):
         """Update daily P&L from all positions"""
         total_unrealised = sum(p.unrealised_pnl for p in self.positions.values())
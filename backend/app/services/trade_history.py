@@ -184,6 +184,12 @@ class TradeHistoryService:
         """
         try:
             from bson.objectid import ObjectId
+            from bson.errors import InvalidId
+            
+            try:
+                oid = ObjectId(trade_id)
+            except (InvalidId, TypeError):
+                return False
             
             update_data = {"updated_at": datetime.now()}
             
@@ -198,24 +204,28 @@ class TradeHistoryService:
             if status is not None:
                 update_data["status"] = status
             
+            # Single round-trip: returns only the fields needed for the
+            # performance update, or None when no trade matched
             collection = self.db["trade_history"]
-            result = await collection.update_one(
-                {"_id": ObjectId(trade_id)},
-                {"$set": update_data}
+            trade = await collection.find_one_and_update(
+                {"_id": oid},
+                {"$set": update_data},
+                projection={"user_id": 1, "strategy": 1}
             )
             
+            if trade is None:
+                return False
+            
             # Update strategy performance if closing
             if status == "CLOSED" and pnl is not None:
-                trade = await collection.find_one({"_id": ObjectId(trade_id)})
-                if trade:
-                    await self._update_strategy_performance(
-                        trade["user_id"],
-                        trade["strategy"],
-                        pnl,
-                        pnl_percentage or 0
-                    )
-            
-            return result.modified_count > 0
+                await self._update_strategy_performance(
+                    trade["user_id"],
+                    trade["strategy"],
+                    pnl,
+                    pnl_percentage or 0
+                )
+            
+            return True
             
         except Exception as e:
             print(f"Error updating trade: {e}")
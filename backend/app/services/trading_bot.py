@@ -2,11 +2,18 @@
 Trading Bot Controller
 Orchestrates all components for automated trading
 """
-from typing import Dict, List, Optional, Callable
-from datetime import datetime, time as datetime_time
+from typing import Dict, List, Optional, Callable, Tuple
+from datetime import datetime, timedelta, time as datetime_time
 import threading
 import time
+import concurrent.futures
+import importlib
+import logging
+import math
+import queue
 from enum import Enum
+from dataclasses import dataclass, asdict
+import pandas as pd
 
 from app.services.kite_auth import kite_auth_service
 from app.services.market_hours import market_hours
@@ -20,6 +27,96 @@ from app.strategies.renko_macd_strategy import RenkoMACDStrategy, RenkoMACDStrat
 from app.strategies.breakout_strategy import BreakoutStrategy
 from app.strategies.pattern_strategy import PatternConfirmationStrategy
 from app.config import DEFAULT_STRATEGY
+from app.utils.log_utils import get_logger
+
+logger = get_logger("trading_bot")
+
+
+# Candle length per Kite interval, used to bucket the historical-data cache
+INTERVAL_SECONDS = {
+    "minute": 60,
+    "3minute": 180,
+    "5minute": 300,
+    "10minute": 600,
+    "15minute": 900,
+    "30minute": 1800,
+    "60minute": 3600,
+    "day": 86400,
+}
+
+# Candles start at the 09:15 IST session open, not on UTC epoch multiples.
+# IST has no DST, so any day's open anchors the buckets of every day
+_CANDLE_ANCHOR = market_hours.IST.localize(
+    datetime.combine(datetime(2024, 1, 1), market_hours.MARKET_OPEN)
+).timestamp()
+
+
+def _candle_bucket(ts: float, timeframe: str) -> int:
+    """Index of the candle period containing epoch time ts"""
+    return int((ts - _CANDLE_ANCHOR) // INTERVAL_SECONDS.get(timeframe, 300))
+
+
+# ==================== STRATEGY REGISTRY ====================
+
+def _named_config(prefix: str) -> Callable:
+    """Config builder for strategies that take a generic StrategyConfig"""
+    def build(symbol: str, capital: float, params: Dict) -> StrategyConfig:
+        return StrategyConfig(
+            name=f"{prefix}_{symbol}",
+            symbol=symbol,
+            capital=capital,
+            params=params
+        )
+    return build
+
+
+def _kwargs_config(config_cls) -> Callable:
+    """Config builder for strategies whose config takes params as kwargs"""
+    def build(symbol: str, capital: float, params: Dict):
+        return config_cls(symbol=symbol, capital=capital, **params)
+    return build
+
+
+# strategy_type -> (config builder, strategy class)
+STRATEGY_REGISTRY: Dict[str, Tuple[Callable, type]] = {
+    "supertrend": (_kwargs_config(SupertrendStrategyConfig), SupertrendStrategy),
+    "ema_rsi": (_named_config("EMA_RSI"), EMA_RSI_Strategy),
+    "renko_macd": (_kwargs_config(RenkoMACDStrategyConfig), RenkoMACDStrategy),
+    "breakout": (_named_config("Breakout"), BreakoutStrategy),
+    "pattern": (_named_config("Pattern"), PatternConfirmationStrategy),
+}
+
+
+def _register_optional_strategy(strategy_type: str, module: str, class_name: str, prefix: str):
+    """Register a strategy whose module may be missing without failing startup"""
+    try:
+        strategy_cls = getattr(importlib.import_module(module), class_name)
+    except (ImportError, AttributeError) as e:
+        logger.warning("⚠ Strategy '%s' unavailable: %s", strategy_type, e)
+        return
+    STRATEGY_REGISTRY[strategy_type] = (_named_config(prefix), strategy_cls)
+
+
+_register_optional_strategy("scalping", "app.strategies.scal_strategy", "ScalpingStrategy", "Scalping")
+_register_optional_strategy("ema_scalping", "app.strategies.ema_scalping_strategy", "EMAScalpingStrategy", "EMA_Scalping")
+_register_optional_strategy("orb", "app.strategies.orb_strategy", "ORBStrategy", "ORB")
+
+
+# Field order of TradingBot._status_snapshot
+STATUS_FIELDS = (
+    "status",
+    "active_strategies",
+    "active_positions",
+    "signals_generated",
+    "orders_placed",
+    "trades_today",
+    "pnl_today",
+)
+
+
+def _noop(*args, **kwargs):
+    """Stand-in for mode-specific steps that don't apply"""
+    return None
 
 
 class BotStatus(Enum):
@@ -32,6 +129,23 @@ class BotStatus(Enum):
     ERROR = "error"
 
 
+@dataclass(slots=True)
+class BotPosition:
+    """Position opened by the bot (quantity is negative for shorts)"""
+    entry_price: float
+    quantity: int
+    stop_loss: float
+    order_ids: Dict
+
+
+class _IterationCache:
+    """Broker reads shared across one _bot_loop iteration"""
+    __slots__ = ("positions",)
+    
+    def __init__(self):
+        self.positions: Optional[Dict] = None
+
+
 class TradingBot:
     """
     Main Trading Bot Controller
@@ -49,28 +163,82 @@ class TradingBot:
     def __init__(self):
         self.status = BotStatus.STOPPED
         self.strategies: Dict[str, any] = {}
-        self.active_positions: Dict[str, any] = {}
+        self.active_positions: Dict[str, BotPosition] = {}
+        self._sl_order_id: Dict[str, str] = {}  # symbol -> protective SL order id
         self.timeframe = "5minute"
         
         # Settings
         self.auto_square_off_time = datetime_time(15, 15)  # 3:15 PM
         self.check_interval = 60  # Check every 60 seconds
+        self.max_error_backoff = 60.0  # Cap for retry delay after loop errors
+        
+        # Today's session boundaries as epoch seconds (see _refresh_session_epochs)
+        self._market_open_epoch = 0.0
+        self._market_close_epoch = 0.0
+        self._sqoff_epoch = 0.0
+        self._session_day_end_epoch = 0.0
         
         # Statistics
         self.trades_today = 0
         self.pnl_today = 0.0
         self.signals_generated = 0
         self.orders_placed = 0
+        self.signals_dropped = 0
         
         # Threading
         self.bot_thread = None
         self.stop_flag = threading.Event()
-        self.lock = threading.Lock()
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        
+        # Separate pool for basket order placement, so entries never wait
+        # behind strategy evaluations (or hung data fetches) in _executor
+        self._order_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        
+        # Timed-out evaluations still running in the pool, per symbol. A
+        # symbol is skipped until its evaluation finishes, so one strategy
+        # never runs generate_signal in two threads at once
+        self._running: Dict[str, concurrent.futures.Future] = {}
+        
+        # Order submission queue, drained by _order_worker so broker
+        # round-trips don't block signal generation
+        self._order_queue: queue.Queue = queue.Queue(maxsize=1024)
+        self._order_thread = None
+        
+        # Historical data cache: {(symbol, interval, bucket): DataFrame}
+        # A bucket is one candle period, so each bar is fetched once per interval
+        self._hist_cache: Dict[Tuple[str, str, int], pd.DataFrame] = {}
+        self._hist_cache_bucket = 0
+        
+        # Latest batched LTP snapshot {"NSE:SYMBOL": {...}}, shared between
+        # the paper P&L refresh and strategy processing
+        self._latest_ltp: Dict[str, Dict] = {}
+        self._latest_ltp_ts = 0.0
+        
+        # Interned "NSE:SYMBOL" quote keys and their reverse map
+        self._nse_keys: Dict[str, str] = {}
+        self._key_to_sym: Dict[str, str] = {}
+        
+        # Per-iteration broker read cache, replaced at the top of each loop
+        self._iter = _IterationCache()
+        
+        # PAPER_TRADING_MODE is fixed for the process lifetime, so the
+        # paper-only steps are bound once here rather than checked per cycle
+        self._refresh_paper_ltps: Callable = (
+            self._update_paper_trading_ltps if PAPER_TRADING_MODE else _noop
+        )
+        self._paper_update_ltps: Callable = (
+            paper_engine.update_ltps if PAPER_TRADING_MODE else _noop
+        )
         
         # Callbacks
         self.on_signal_callbacks: List[Callable] = []
         self.on_order_callbacks: List[Callable] = []
         self.on_status_change_callbacks: List[Callable] = []
+        
+        # Immutable status tuple (see STATUS_FIELDS), replaced wholesale so
+        # HTTP threads can read it without locking
+        self._status_snapshot: Tuple = ()
+        self._publish_status()
     
     # ==================== BOT CONTROL ====================
     
@@ -135,6 +303,7 @@ class TradingBot:
                     **strategy_params
                 )
                 self.strategies[symbol] = strategy
+                self._nse_key(symbol)
                 total_allocated_capital += capital_per_symbol
                 print(f"✓ Strategy initialized for {symbol}")
             
@@ -152,14 +321,29 @@ class TradingBot:
                 enable_storage=enable_tick_storage
             )
             
-            # Register tick callback
-            for symbol in symbols:
+            # Register pre-bound tick handlers
+            for symbol, strategy in self.strategies.items():
                 tick_processor.strategy_callbacks[symbol] = [
-                    lambda tick, s=symbol: self._on_tick_received(s, tick)
+                    self._make_tick_handler(symbol, strategy)
                 ]
             
-            # Start monitoring thread
+            # Worker pool for per-symbol data fetch + signal generation
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(32, len(symbols)) or 1,
+                thread_name_prefix="bot-worker"
+            )
+            
+            # Order placement pool: a basket holds at most one entry per symbol
+            self._order_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(10, len(symbols)) or 1,
+                thread_name_prefix="bot-order"
+            )
+            
+            # Start order worker and monitoring thread
+            self._refresh_session_epochs()
             self.stop_flag.clear()
+            self._order_thread = threading.Thread(target=self._order_worker, daemon=True)
+            self._order_thread.start()
             self.bot_thread = threading.Thread(target=self._bot_loop, daemon=True)
             self.bot_thread.start()
             
@@ -183,9 +367,8 @@ class TradingBot:
             
         except Exception as e:
             self._update_status(BotStatus.ERROR)
-            print(f"✗ ERROR starting bot: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            # Full traceback only when verbose logging is on
+            logger.error("✗ ERROR starting bot: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return {
                 "success": False,
                 "message": f"Failed to start bot: {str(e)}"
@@ -213,9 +396,22 @@ class TradingBot:
         try:
             # Stop monitoring thread
             self.stop_flag.set()
-            if self.bot_thread:
+            if self.bot_thread and self.bot_thread is not threading.current_thread():
                 self.bot_thread.join(timeout=5)
             
+            # Stop order worker, discarding signals that were never sent. A
+            # batch already going out is finished, so its orders get tracked
+            self._stop_order_worker()
+            if self._order_executor:
+                self._order_executor.shutdown(wait=False)
+                self._order_executor = None
+            
+            # Shut down worker pool (don't wait on in-flight REST calls)
+            if self._executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._running.clear()
+            
             # Stop tick processor
             tick_processor.stop()
             
@@ -232,6 +428,10 @@ class TradingBot:
             # Clear strategies
             self.strategies.clear()
             self.active_positions.clear()
+            self._sl_order_id.clear()
+            self._hist_cache.clear()
+            self._nse_keys.clear()
+            self._key_to_sym.clear()
             
             self._update_status(BotStatus.STOPPED)
             
@@ -283,10 +483,13 @@ class TradingBot:
             
             # Clear bot positions
             self.active_positions.clear()
+            self._sl_order_id.clear()
             self.trades_today = 0
             self.pnl_today = 0.0
             self.signals_generated = 0
             self.orders_placed = 0
+            self.signals_dropped = 0
+            self._publish_status()
             
             # Reset each strategy
             for symbol, strategy in self.strategies.items():
@@ -320,108 +523,43 @@ class TradingBot:
         **params
     ):
         """Create strategy instance based on type"""
-        
-        if strategy_type == "supertrend":
-            config = SupertrendStrategyConfig(
-                symbol=symbol,
-                capital=capital,
-                **params
-            )
-            return SupertrendStrategy(config)
-        
-        elif strategy_type == "scalping":
-            from app.strategies.scal_strategy import ScalpingStrategy
-            config = StrategyConfig(
-                name=f"Scalping_{symbol}",
-                symbol=symbol,
-                capital=capital,
-                params=params
-            )
-            return ScalpingStrategy(config)
-            
-        elif strategy_type == "ema_scalping":
-            from app.strategies.ema_scalping_strategy import EMAScalpingStrategy
-            config = StrategyConfig(
-                name=f"EMA_Scalping_{symbol}",
-                symbol=symbol,
-                capital=capital,
-                params=params
-            )
-            return EMAScalpingStrategy(config)
-            
-        elif strategy_type == "orb":
-            from app.strategies.orb_strategy import ORBStrategy
-            config = StrategyConfig(
-                name=f"ORB_{symbol}",
-                symbol=symbol,
-                capital=capital,
-                params=params
-            )
-            return ORBStrategy(config)
-
-        elif strategy_type == "ema_rsi":
-            config = StrategyConfig(
-                name=f"EMA_RSI_{symbol}",
-                symbol=symbol,
-                capital=capital,
-                params=params
-            )
-            return EMA_RSI_Strategy(config)
-        
-        elif strategy_type == "renko_macd":
-            config = RenkoMACDStrategyConfig(
-                symbol=symbol,
-                capital=capital,
-                **params
-            )
-            return RenkoMACDStrategy(config)
-        
-        elif strategy_type == "breakout":
-            config = StrategyConfig(
-                name=f"Breakout_{symbol}",
-                symbol=symbol,
-                capital=capital,
-                params=params
-            )
-            return BreakoutStrategy(config)
-        
-        elif strategy_type == "pattern":
-            config = StrategyConfig(
-                name=f"Pattern_{symbol}",
-                symbol=symbol,
-                capital=capital,
-                params=params
-            )
-            return PatternConfirmationStrategy(config)
-        
-        else:
+        entry = STRATEGY_REGISTRY.get(strategy_type)
+        if entry is None:
             raise ValueError(f"Unknown strategy type: {strategy_type}")
+        
+        build_config, strategy_cls = entry
+        return strategy_cls(build_config(symbol, capital, params))
     
     # ==================== BOT LOOP ====================
     
     def _bot_loop(self):
         """Main bot monitoring loop"""
-        print("Bot monitoring loop started")
+        logger.info("Bot monitoring loop started")
+        backoff = 1.0
         
         while not self.stop_flag.is_set():
+            self._iter = _IterationCache()
             try:
                 # 1. Update Paper Trading P&L (Always run this so dashboard stays alive)
-                if PAPER_TRADING_MODE:
-                    self._update_paper_trading_ltps()
+                self._refresh_paper_ltps()
 
                 # 2. Check if market is open
-                if not market_hours.is_market_open():
+                now_ts = time.time()
+                if now_ts >= self._session_day_end_epoch:
+                    self._refresh_session_epochs()
+                
+                if not (self._market_open_epoch <= now_ts < self._market_close_epoch):
                     # Check if we should override for testing
                     # For now just log and wait
                     if self.signals_generated == 0 and self.trades_today == 0:
-                         print(f"⏳ Market closed ({datetime.now().strftime('%H:%M')}). Bot waiting for market open...")
-                    time.sleep(60)
+                        logger.info("⏳ Market closed (%s). Bot waiting for market open...", datetime.now().strftime('%H:%M'))
+                    if self.stop_flag.wait(60):
+                        break
                     continue
                 
                 # 3. Check for auto square-off time
-                now = datetime.now().time()
-                if now >= self.auto_square_off_time:
-                    print("🕒 Auto square-off time reached")
+                if now_ts >= self._sqoff_epoch:
+                    logger.info("🕒 Auto square-off time reached")
                     self._auto_square_off()
                     break
                 
@@ -431,16 +569,66 @@ class TradingBot:
                 
                 # 5. Update statistics
                 self._update_statistics()
+                backoff = 1.0
                 
-                # Sleep until next check
-                time.sleep(self.check_interval)
+                # Sleep until next check (returns early on stop)
+                if self.stop_flag.wait(self.check_interval):
+                    break
                 
             except Exception as e:
-                print(f"✗ Error in bot loop: {str(e)}")
-                time.sleep(10)  # Wait before retry
+                logger.error(
+                    "✗ Error in bot loop: %s (retrying in %.0fs)", e, backoff,
+                    exc_info=logger.isEnabledFor(logging.DEBUG)
+                )
+                # Exponential backoff on repeated failures (1s -> 2s -> ... -> cap)
+                if self.stop_flag.wait(backoff):
+                    break
+                backoff = min(backoff * 2, self.max_error_backoff)
         
-        print("Bot monitoring loop stopped")
+        logger.info("Bot monitoring loop stopped")
 
+    def _nse_key(self, symbol: str) -> str:
+        """Quote key for an NSE symbol, built once per symbol"""
+        key = self._nse_keys.get(symbol)
+        if key is None:
+            key = f"NSE:{symbol}"
+            self._nse_keys[symbol] = key
+            self._key_to_sym[key] = symbol
+        return key
+    
+    def _get_positions(self) -> Dict:
+        """Broker positions, fetched at most once per loop iteration"""
+        cache = self._iter
+        if cache.positions is None:
+            cache.positions = order_service.get_positions()
+        return cache.positions
+    
+    def _refresh_session_epochs(self):
+        """
+        Precompute today's market open/close and square-off times (IST) as
+        epoch seconds so the bot loop only does float comparisons.
+        Holidays and weekends get an empty session.
+        """
+        ist = market_hours.IST
+        now = market_hours.get_ist_now()
+        today = now.date()
+        
+        def epoch(t: datetime_time) -> float:
+            return ist.localize(datetime.combine(today, t)).timestamp()
+        
+        self._session_day_end_epoch = ist.localize(
+            datetime.combine(today + timedelta(days=1), datetime_time(0, 0))
+        ).timestamp()
+        
+        if market_hours.is_market_holiday(now):
+            self._market_open_epoch = self._session_day_end_epoch
+            self._market_close_epoch = self._session_day_end_epoch
+        else:
+            self._market_open_epoch = epoch(market_hours.MARKET_OPEN)
+            self._market_close_epoch = epoch(market_hours.MARKET_CLOSE)
+        
+        self._sqoff_epoch = epoch(self.auto_square_off_time)
+    
     def _update_paper_trading_ltps(self):
         """
         Update LTP for all active symbols in Paper Trading Engine.
@@ -448,155 +636,289 @@ class TradingBot:
         """
         try:
             # Get all symbols from active strategies + working positions
-            symbols = set(self.strategies.keys())
+            keys = {self._nse_key(s) for s in self.strategies}
             
             # Add symbols from active positions
-            positions = order_service.get_positions()
+            positions = self._get_positions()
             if 'net' in positions:
                 for pos in positions['net']:
-                    symbols.add(pos['tradingsymbol'])
+                    keys.add(self._nse_key(pos['tradingsymbol']))
             
-            if not symbols:
+            if not keys:
                 return
 
             # Fetch LTPs in batch
-            ltp_map = market_data_service.get_ltp([f"NSE:{s}" for s in symbols])
-            
-            # Update Paper Engine
-            count = 0
-            for full_symbol, data in ltp_map.items():
-                if 'last_price' in data:
-                    symbol = full_symbol.split(':')[1]
-                    paper_engine.update_ltp(symbol, "NSE", data['last_price'])
-                    count += 1
+            ltp_map = market_data_service.get_ltp(list(keys))
+            self._latest_ltp = ltp_map
+            self._latest_ltp_ts = time.time()
             
-            # print(f"✓ Updated P&L for {count} symbols")
+            # Update Paper Engine in one pass
+            key_to_sym = self._key_to_sym
+            prices = {
+                key_to_sym[key]: data['last_price']
+                for key, data in ltp_map.items()
+                if key in key_to_sym and 'last_price' in data
+            }
+            paper_engine.update_ltps("NSE", prices)
             
         except Exception as e:
             # Fail silently to avoid spamming logs
             pass
     
     def _process_strategies(self):
-        """Process all active strategies"""
-        for symbol, strategy in self.strategies.items():
-            try:
-                # Fetch latest OHLC data
-                df = market_data_service.get_historical_data_by_symbol(
-                    symbol=symbol,
-                    exchange="NSE",
-                    interval=self.timeframe,
-                    days_back=5
-                )
-                
-                if df.empty:
-                    continue
-                
-                # Get current price
-                ltp = market_data_service.get_ltp(symbol, "NSE")
-                if not ltp:
-                    continue
-                
-                current_price = ltp.get('last_price', 0)
-                
-                # Update paper trading engine with LTP
-                if PAPER_TRADING_MODE:
-                    paper_engine.update_ltp(symbol, "NSE", current_price)
-                
-                # Generate signal
-                signal = strategy.generate_signal(df, current_price)
-                
-                if signal:
-                    self.signals_generated += 1
-                    self._execute_signal(signal)
-                
-            except Exception as e:
-                print(f"✗ Error processing strategy for {symbol}: {str(e)}")
-    
-    def _on_tick_received(self, symbol: str, tick: Dict):
-        """Handle tick data for real-time strategies (e.g., Renko+MACD)"""
-        if symbol not in self.strategies:
+        """
+        Process all active strategies
+        
+        Per-symbol data fetch and signal generation is I/O bound, so it is
+        fanned out to the worker pool. Signals are executed back on the bot
+        thread so order placement and counters stay serialized.
+        """
+        executor = self._executor
+        if executor is None or not self.strategies:
             return
         
-        strategy = self.strategies[symbol]
+        # Roll the historical cache over when a new candle period starts
+        bucket = _candle_bucket(time.time(), self.timeframe)
+        if bucket != self._hist_cache_bucket:
+            self._hist_cache.clear()
+            self._hist_cache_bucket = bucket
+        
+        # Reuse this cycle's LTP snapshot; batch-fetch only what's missing or stale
+        ltp_map = self._latest_ltp
+        if time.time() - self._latest_ltp_ts > self.check_interval:
+            ltp_map = {}
+        nse_keys = self._nse_keys
+        missing = [nse_keys[s] for s in self.strategies if nse_keys[s] not in ltp_map]
+        if missing:
+            fetched = market_data_service.get_ltp(missing)
+            ltp_map = {**ltp_map, **fetched}
+            key_to_sym = self._key_to_sym
+            self._paper_update_ltps("NSE", {
+                key_to_sym[key]: data['last_price']
+                for key, data in fetched.items()
+                if key in key_to_sym and 'last_price' in data
+            })
+        
+        # One clock read stamps every strategy's evaluation this cycle
+        now = datetime.now()
+        
+        running = self._running
+        futures = {}
+        for symbol, strategy in list(self.strategies.items()):
+            ltp = ltp_map.get(nse_keys[symbol])
+            if not ltp:
+                continue
+            
+            # Previous evaluation still in flight: its result is stale anyway
+            earlier = running.get(symbol)
+            if earlier is not None:
+                if not earlier.done():
+                    logger.debug("Skipping %s: previous evaluation still running", symbol)
+                    continue
+                del running[symbol]
+            
+            future = executor.submit(
+                self._process_one, symbol, strategy, ltp.get('last_price', 0), bucket, now
+            )
+            futures[future] = symbol
+        
+        done, not_done = concurrent.futures.wait(
+            futures, timeout=max(self.check_interval - 5, 1)
+        )
         
-        # Update paper trading engine with latest price for live P&L calculation
-        if PAPER_TRADING_MODE and 'last_price' in tick:
-            exchange = tick.get('exchange', 'NSE')
-            paper_engine.update_ltp(symbol, exchange, tick['last_price'])
+        for future in not_done:
+            # cancel() only stops evaluations that have not started yet
+            if not future.cancel():
+                running[futures[future]] = future
+            logger.warning("✗ Strategy processing timed out for %s", futures[future])
         
-        # Process tick in strategy (e.g., update Renko bricks)
-        if hasattr(strategy, 'process_tick'):
+        for future in done:
             try:
-                strategy.process_tick(tick)
+                signal = future.result()
             except Exception as e:
-                print(f"✗ Error processing tick for {symbol}: {str(e)}")
+                logger.error(
+                    "✗ Error processing strategy for %s: %s", futures[future], e,
+                    exc_info=logger.isEnabledFor(logging.DEBUG)
+                )
+                continue
+            
+            if signal:
+                self.signals_generated += 1
+                self._execute_signal(signal)
+        
+        self._publish_status()
+    
+    def _process_one(self, symbol: str, strategy, current_price: float, bucket: int, now: datetime):
+        """Fetch data and generate a signal for a single symbol"""
+        # Fetch latest OHLC data (once per candle period)
+        key = (symbol, self.timeframe, bucket)
+        df = self._hist_cache.get(key)
+        if df is None:
+            to_date = now
+            df = market_data_service.get_historical_data_by_symbol(
+                symbol=symbol,
+                exchange="NSE",
+                from_date=to_date - timedelta(days=5),
+                to_date=to_date,
+                interval=self.timeframe
+            )
+            self._hist_cache[key] = df
+        
+        if df.empty:
+            return None
+        
+        # Generate signal
+        return strategy.generate_signal(df, current_price, now)
+    
+    def _make_tick_handler(self, symbol: str, strategy) -> Callable:
+        """
+        Build the tick callback for a symbol (e.g., Renko+MACD real-time updates)
+        
+        The strategy's process_tick method and the paper LTP updater are
+        resolved once here, so the per-tick path does no dict lookups,
+        mode checks or hasattr reflection.
+        """
+        process_tick = getattr(strategy, 'process_tick', None)
+        update_ltp = paper_engine.update_ltp if PAPER_TRADING_MODE else None
+        
+        def on_tick(tick: Dict, pt=process_tick, ul=update_ltp, s=symbol):
+            # Update paper trading engine with latest price for live P&L calculation
+            if ul is not None:
+                price = tick.get('last_price')
+                if price is not None:
+                    ul(s, tick.get('exchange', 'NSE'), price)
+            
+            # Process tick in strategy (e.g., update Renko bricks)
+            if pt is not None:
+                try:
+                    pt(tick)
+                except Exception as e:
+                    logger.error("✗ Error processing tick for %s: %s", s, e)
+        
+        return on_tick
     
     # ==================== SIGNAL EXECUTION ====================
     
     def _execute_signal(self, signal):
-        """Execute trading signal"""
+        """Queue trading signal for execution by the order worker"""
         try:
-            print(f"\n📊 SIGNAL GENERATED: {signal.signal_type.value} {signal.symbol}")
-            print(f"   Price: ₹{signal.price:.2f}")
-            print(f"   Quantity: {signal.quantity}")
-            print(f"   Reason: {signal.reason}")
+            self._order_queue.put_nowait(signal)
+        except queue.Full:
+            self.signals_dropped += 1
+            logger.warning("✗ Order queue full, dropping %s signal for %s", signal.signal_type.value, signal.symbol)
+    
+    def _order_worker(self):
+        """Drain the order queue and place orders in batches"""
+        while True:
+            signal = self._order_queue.get()
+            if signal is None:  # Shutdown sentinel
+                break
             
-            # Notify callbacks
-            for callback in self.on_signal_callbacks:
-                callback(signal)
-            
-            # Execute based on signal type
-            if signal.signal_type.value == "BUY":
-                result = order_service.place_market_order_with_sl(
-                    tradingsymbol=signal.symbol,
-                    exchange="NSE",
-                    transaction_type="BUY",
-                    quantity=signal.quantity,
-                    sl_price=signal.stop_loss,
-                    tag=f"BOT_{signal.symbol}"
-                )
-                
-                if result['success']:
-                    self.orders_placed += 1
-                    self.active_positions[signal.symbol] = {
-                        'entry_price': signal.price,
-                        'quantity': signal.quantity,
-                        'stop_loss': signal.stop_loss,
-                        'order_ids': result
-                    }
-                    print(f"✓ BUY order executed for {signal.symbol}")
+            # Take everything queued this cycle as one batch
+            batch = [signal]
+            stop = False
+            while True:
+                try:
+                    signal = self._order_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if signal is None:
+                    stop = True
+                    break
+                batch.append(signal)
+            
+            self._handle_signals(batch)
+            if stop:
+                break
+    
+    def _stop_order_worker(self):
+        """Discard pending signals and stop the order worker"""
+        while True:
+            try:
+                self._order_queue.get_nowait()
+            except queue.Empty:
+                break
+        
+        if self._order_thread:
+            self._order_queue.put(None)
+            if self._order_thread is not threading.current_thread():
+                self._order_thread.join(timeout=5)
+            self._order_thread = None
+    
+    def _handle_signals(self, signals: List):
+        """Execute a batch of trading signals"""
+        try:
+            buys, sells, holds = [], [], []
+            route = {"BUY": buys.append, "SELL": sells.append, "HOLD": holds.append}
+            
+            for signal in signals:
+                stype = signal.signal_type.value
+                logger.info("📊 SIGNAL GENERATED: %s %s", stype, signal.symbol)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"   Price: ₹{signal.price:.2f}\n"
+                        f"   Quantity: {signal.quantity}\n"
+                        f"   Reason: {signal.reason}"
+                    )
                 
-            elif signal.signal_type.value == "SELL":
-                result = order_service.place_market_order_with_sl(
-                    tradingsymbol=signal.symbol,
-                    exchange="NSE",
-                    transaction_type="SELL",
-                    quantity=signal.quantity,
-                    sl_price=signal.stop_loss,
-                    tag=f"BOT_{signal.symbol}"
-                )
+                # Notify callbacks
+                for callback in self.on_signal_callbacks:
+                    callback(signal)
                 
-                if result['success']:
-                    self.orders_placed += 1
-                    self.active_positions[signal.symbol] = {
-                        'entry_price': signal.price,
-                        'quantity': -signal.quantity,
-                        'stop_loss': signal.stop_loss,
-                        'order_ids': result
-                    }
-                    print(f"✓ SELL order executed for {signal.symbol}")
-            
-            elif signal.signal_type.value == "HOLD":
+                handler = route.get(stype)
+                if handler:
+                    handler(signal)
+            
+            # Entries go to the broker as one basket, BUYs first
+            entries = [(signal, "BUY") for signal in buys] + [(signal, "SELL") for signal in sells]
+            orders = [
+                {
+                    'tradingsymbol': signal.symbol,
+                    'exchange': "NSE",
+                    'transaction_type': side,
+                    'quantity': signal.quantity,
+                    'sl_price': signal.stop_loss,
+                    'tag': f"BOT_{signal.symbol}"
+                }
+                for signal, side in entries
+            ]
+            # Reuse the bot's order pool rather than spawning threads per batch
+            results = order_service.place_basket_orders(orders, executor=self._order_executor)
+            
+            for (signal, side), result in zip(entries, results):
+                self._do_trade(signal, side, result)
+            
+            for signal in holds:
                 # Update stop-loss if needed
                 if signal.metadata and signal.metadata.get('action') == 'update_sl':
                     self._update_stop_loss(signal)
             
+            self._publish_status()
+            
             # Notify callbacks
-            for callback in self.on_order_callbacks:
-                callback(signal)
+            for signal in signals:
+                for callback in self.on_order_callbacks:
+                    callback(signal)
             
         except Exception as e:
-            print(f"✗ Error executing signal: {str(e)}")
+            logger.error("✗ Error executing signals: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+    
+    def _do_trade(self, signal, side: str, result: Dict):
+        """Record the outcome of a BUY/SELL entry order"""
+        if not result['success']:
+            logger.error("✗ %s order failed for %s: %s", side, signal.symbol, result.get('message'))
+            return
+        
+        self.orders_placed += 1
+        self.active_positions[signal.symbol] = BotPosition(
+            entry_price=signal.price,
+            quantity=signal.quantity if side == "BUY" else -signal.quantity,
+            stop_loss=signal.stop_loss,
+            order_ids=result
+        )
+        if result.get('sl_order_id'):
+            self._sl_order_id[signal.symbol] = result['sl_order_id']
+        logger.info("✓ %s order executed for %s", side, signal.symbol)
     
     def _update_stop_loss(self, signal):
         """Update stop-loss for active position"""
@@ -605,26 +927,23 @@ class TradingBot:
             if not position:
                 return
             
-            # Get pending SL order
-            orders = order_service.get_orders()
-            for order in orders:
-                if (order['tradingsymbol'] == signal.symbol and 
-                    order['status'] in ['TRIGGER PENDING', 'OPEN'] and
-                    order['order_type'] in ['SL', 'SL-M']):
-                    
-                    # Modify SL order
-                    order_service.modify_order(
-                        order_id=order['order_id'],
-                        price=signal.stop_loss,
-                        trigger_price=signal.stop_loss
-                    )
-                    
-                    position['stop_loss'] = signal.stop_loss
-                    print(f"✓ Stop-loss updated for {signal.symbol}: ₹{signal.stop_loss:.2f}")
-                    break
+            # SL order placed alongside the entry
+            sl_order_id = self._sl_order_id.get(signal.symbol)
+            if not sl_order_id:
+                return
+            
+            # Modify SL order
+            order_service.modify_order(
+                order_id=sl_order_id,
+                price=signal.stop_loss,
+                trigger_price=signal.stop_loss
+            )
+            
+            position.stop_loss = signal.stop_loss
+            logger.info("✓ Stop-loss updated for %s: ₹%.2f", signal.symbol, signal.stop_loss)
         
         except Exception as e:
-            print(f"✗ Error updating stop-loss: {str(e)}")
+            logger.error("✗ Error updating stop-loss: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
     
     # ==================== AUTO SQUARE-OFF ====================
     
@@ -652,25 +971,27 @@ class TradingBot:
         """Update bot statistics"""
         try:
             # Fetch positions
-            positions = order_service.get_positions()
+            positions = self._get_positions()
             day_positions = positions.get('day', [])
             
-            # Calculate P&L
-            total_pnl = sum(pos.get('pnl', 0) for pos in day_positions)
-            self.pnl_today = total_pnl
+            # Calculate P&L (fsum avoids accumulated float rounding error)
+            self.pnl_today = math.fsum(pos.get('pnl') or 0.0 for pos in day_positions)
             
             # Count trades
             trades = order_service.get_trades()
             self.trades_today = len(trades)
             
+            self._publish_status()
+            
         except Exception as e:
-            print(f"✗ Error updating statistics: {str(e)}")
+            logger.error("✗ Error updating statistics: %s", e)
     
     # ==================== STATUS & INFO ====================
     
     def _update_status(self, new_status: BotStatus):
         """Update bot status and notify callbacks"""
         self.status = new_status
+        self._publish_status()
         
         for callback in self.on_status_change_callbacks:
             try:
@@ -678,25 +999,33 @@ class TradingBot:
             except Exception as e:
                 print(f"✗ Error in status callback: {str(e)}")
     
+    def _publish_status(self):
+        """Rebuild the status snapshot read by get_status()"""
+        self._status_snapshot = (
+            self.status.value,
+            len(self.strategies),
+            len(self.active_positions),
+            self.signals_generated,
+            self.orders_placed,
+            self.trades_today,
+            self.pnl_today,
+        )
+    
     def get_status(self) -> Dict:
         """Get current bot status"""
-        return {
-            "status": self.status.value,
-            "active_strategies": len(self.strategies),
-            "active_positions": len(self.active_positions),
-            "signals_generated": self.signals_generated,
-            "orders_placed": self.orders_placed,
-            "trades_today": self.trades_today,
-            "pnl_today": self.pnl_today,
-            "strategies": {
-                symbol: strategy.get_status()
-                for symbol, strategy in self.strategies.items()
-            }
+        status = dict(zip(STATUS_FIELDS, self._status_snapshot))
+        status["strategies"] = {
+            symbol: strategy.get_status()
+            for symbol, strategy in tuple(self.strategies.items())
         }
+        return status
     
     def get_positions(self) -> Dict:
         """Get active positions"""
-        return self.active_positions.copy()
+        return {
+            symbol: asdict(position)
+            for symbol, position in self.active_positions.items()
+        }
     
     # ==================== CALLBACKS ====================
     
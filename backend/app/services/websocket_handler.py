@@ -3,11 +3,16 @@ WebSocket Handler for KiteTicker
 Manages real-time tick data streaming from Zerodha Kite Connect
 """
 from kiteconnect import KiteTicker
+from twisted.internet import reactor
+from twisted.python import threadable
 from typing import Dict, List, Callable, Optional
 from datetime import datetime
 import threading
-import time
+import queue
 from app.services.kite_auth import kite_auth_service
+from app.utils.log_utils import get_logger
+
+logger = get_logger("websocket_handler")
 
 
 
@@ -18,11 +23,26 @@ class WebSocketHandler:
     Manages connections, subscriptions, and tick data streaming
     """
     
+    # Kite allows 3 WebSocket connections per API key, 3000 instruments each
+    max_connections = 3
+    max_tokens_per_connection = 3000
+    
+    # Tokens a connection takes before another one is opened; spreading keeps
+    # each socket's frames small so one busy connection doesn't hold up the rest
+    tokens_per_connection = 1000
+    
     def __init__(self):
-        self.ticker: Optional[KiteTicker] = None
+        # Connection pool: one KiteTicker per shard
+        self.tickers: List[KiteTicker] = []
+        self.shard_tokens: List[set] = []
+        self.token_to_ticker: Dict[int, int] = {}
         self.is_connected = False
         self.subscribed_tokens = set()
         
+        # Read-only snapshot of subscribed_tokens for status calls; rebuilt
+        # by the reactor thread only when subscriptions change
+        self._token_list: tuple = ()
+        
         # Callbacks
         self.tick_callbacks: List[Callable] = []
         self.connect_callbacks: List[Callable] = []
@@ -31,15 +51,34 @@ class WebSocketHandler:
         
         # Reconnection settings
         self.auto_reconnect = True
-        self.reconnect_delay = 5  # seconds
+        self.reconnect_delay = 5  # seconds, doubled after every attempt
+        self.max_reconnect_delay = 60
         self.max_reconnect_attempts = 10
         self.reconnect_attempts = 0
+        self._reconnect_call = None  # Pending reactor.callLater handle
+        
+        # Tick pipeline: the KiteTicker reader thread only enqueues batches;
+        # _dispatch_loop fans them out so slow callbacks never block the socket.
+        # Bounded: when consumers fall behind the oldest batch is dropped
+        self.tick_queue_size = 8192
+        self.ticks_dropped = 0
         
-        # Thread safety
-        self.lock = threading.Lock()
+        # When set, batches that piled up are merged into one keeping only
+        # the latest tick per instrument. Only for consumers that need the
+        # latest state (LTP, P&L) - candle building needs every tick
+        self.coalesce_ticks = False
+        self._tick_queue: queue.Queue = queue.Queue(maxsize=self.tick_queue_size)
+        self._dispatch_thread: Optional[threading.Thread] = None
     
     def initialize(self):
-        """Initialize KiteTicker with authentication"""
+        """Initialize the first KiteTicker connection with authentication"""
+        if not self.tickers:
+            self._create_ticker()
+        
+        logger.info("✓ WebSocket initialized")
+    
+    def _create_ticker(self) -> KiteTicker:
+        """Create a KiteTicker for the next shard and wire its callbacks"""
         if not kite_auth_service.is_authenticated():
             raise Exception("Not authenticated. Please login first.")
         
@@ -49,67 +88,154 @@ class WebSocketHandler:
         if not api_key or not access_token:
             raise Exception("API key or access token not available")
         
-        self.ticker = KiteTicker(api_key, access_token)
+        ticker = KiteTicker(api_key, access_token)
         
         # Assign callbacks
-        self.ticker.on_ticks = self._on_ticks
-        self.ticker.on_connect = self._on_connect
-        self.ticker.on_close = self._on_close
-        self.ticker.on_error = self._on_error
-        self.ticker.on_reconnect = self._on_reconnect
-        self.ticker.on_noreconnect = self._on_noreconnect
+        ticker.on_ticks = self._on_ticks
+        ticker.on_connect = self._on_connect
+        ticker.on_close = self._on_close
+        ticker.on_error = self._on_error
+        ticker.on_reconnect = self._on_reconnect
+        ticker.on_noreconnect = self._on_noreconnect
         
-        print("✓ WebSocket initialized")
+        self.tickers.append(ticker)
+        return ticker
     
     def connect(self):
-        """Start WebSocket connection"""
-        if not self.ticker:
+        """Start WebSocket connections for every shard"""
+        if not self.tickers:
             self.initialize()
         
-        if self.is_connected:
-            print("⚠ Already connected")
+        # Make sure every shard that holds tokens has a connection
+        while len(self.tickers) < len(self.shard_tokens):
+            self._create_ticker()
+        
+        pending = [t for t in self.tickers if not t.is_connected()]
+        if not pending:
+            logger.warning("⚠ Already connected")
             return
         
-        print("Connecting to WebSocket...")
+        logger.info("Connecting to WebSocket (%d connection(s))...", len(pending))
+        
+        self._start_dispatcher()
         
-        # Start in a separate thread
-        thread = threading.Thread(target=self.ticker.connect, daemon=True)
-        thread.start()
+        # All tickers share Twisted's reactor; threaded mode starts it in a
+        # background thread once, later connections are added on that thread
+        if not reactor.running:
+            pending.pop(0).connect(threaded=True)
+        for ticker in pending:
+            reactor.callFromThread(ticker.connect, threaded=True)
     
     def disconnect(self):
-        """Close WebSocket connection"""
-        if self.ticker and self.is_connected:
-            print("Disconnecting WebSocket...")
-            self.ticker.close()
+        """Close all WebSocket connections"""
+        if self.tickers and self.is_connected:
+            logger.info("Disconnecting WebSocket...")
+            self._call_in_reactor(self._cancel_reconnect)
+            for ticker in self.tickers:
+                self._call_in_reactor(ticker.close)
             self.is_connected = False
+        
+        self._stop_dispatcher()
+    
+    def _call_in_reactor(self, fn: Callable, *args, **kwargs):
+        """
+        Run fn on Twisted's reactor thread
+        
+        The reactor thread owns the tickers and the per-shard subscription
+        sets, so they are never touched concurrently and need no lock.
+        Before the reactor runs nothing else touches them, so fn runs inline.
+        """
+        if reactor.running and not threadable.isInIOThread():
+            reactor.callFromThread(fn, *args, **kwargs)
+        else:
+            fn(*args, **kwargs)
+    
+    def _assign_shard(self, token: int) -> Optional[int]:
+        """
+        Pick the connection a token is streamed on
+        
+        Fills connections up to tokens_per_connection before opening another
+        one, then places tokens on the least loaded connection up to Kite's
+        per-connection cap.
+        
+        Returns:
+            Shard index, or None if every connection is full
+        """
+        shard = self.token_to_ticker.get(token)
+        if shard is not None:
+            return shard
+        
+        loads = self.shard_tokens
+        if loads:
+            shard = min(range(len(loads)), key=lambda i: len(loads[i]))
+        
+        if not loads or (len(loads[shard]) >= self.tokens_per_connection
+                         and len(loads) < self.max_connections):
+            loads.append(set())
+            shard = len(loads) - 1
+        elif len(loads[shard]) >= self.max_tokens_per_connection:
+            return None
+        
+        loads[shard].add(token)
+        self.token_to_ticker[token] = shard
+        return shard
+    
+    def _subscribe_shard(self, shard: int, tokens: List[int], mode: str):
+        """Subscribe tokens on one shard's connection"""
+        ticker = self.tickers[shard]
+        
+        # Set mode
+        if mode == "ltp":
+            ticker_mode = ticker.MODE_LTP
+        elif mode == "quote":
+            ticker_mode = ticker.MODE_QUOTE
+        else:  # full
+            ticker_mode = ticker.MODE_FULL
+        
+        ticker.subscribe(tokens)
+        ticker.set_mode(ticker_mode, tokens)
     
     def subscribe(self, tokens: List[int], mode: str = "full"):
         """
-        Subscribe to instrument tokens
+        Subscribe to instrument tokens, sharded across connections
         
         Args:
             tokens: List of instrument tokens
             mode: 'ltp', 'quote', or 'full'
         """
-        if not self.ticker or not self.is_connected:
-            print("⚠ Not connected. Storing tokens for later subscription.")
-            self.subscribed_tokens.update(tokens)
+        self._call_in_reactor(self._subscribe, list(tokens), mode)
+    
+    def _subscribe(self, tokens: List[int], mode: str):
+        """Assign tokens to shards and subscribe them (reactor thread)"""
+        by_shard: Dict[int, List[int]] = {}
+        rejected = 0
+        for token in tokens:
+            shard = self._assign_shard(token)
+            if shard is None:
+                rejected += 1
+                continue
+            by_shard.setdefault(shard, []).append(token)
+            self.subscribed_tokens.add(token)
+        
+        if len(self.subscribed_tokens) != len(self._token_list):
+            self._token_list = tuple(self.subscribed_tokens)
+        
+        if rejected:
+            logger.warning("⚠ Subscription limit reached. %d instruments not subscribed", rejected)
+        
+        if not self.tickers or not self.is_connected:
+            logger.warning("⚠ Not connected. Storing tokens for later subscription.")
             return
         
-        with self.lock:
-            # Set mode
-            if mode == "ltp":
-                self.ticker.subscribe(tokens)
-                self.ticker.set_mode(self.ticker.MODE_LTP, tokens)
-            elif mode == "quote":
-                self.ticker.subscribe(tokens)
-                self.ticker.set_mode(self.ticker.MODE_QUOTE, tokens)
-            else:  # full
-                self.ticker.subscribe(tokens)
-                self.ticker.set_mode(self.ticker.MODE_FULL, tokens)
-            
-            self.subscribed_tokens.update(tokens)
-            print(f"✓ Subscribed to {len(tokens)} instruments in {mode} mode")
+        for shard, shard_tokens in by_shard.items():
+            if shard >= len(self.tickers):
+                # New shard: its tokens are subscribed once it connects
+                while len(self.tickers) <= shard:
+                    self._create_ticker().connect(threaded=True)
+            elif self.tickers[shard].is_connected():
+                self._subscribe_shard(shard, shard_tokens, mode)
+        
+        logger.info("✓ Subscribed to %d instruments in %s mode", len(tokens) - rejected, mode)
     
     def unsubscribe(self, tokens: List[int]):
         """
@@ -118,20 +244,43 @@ class WebSocketHandler:
         Args:
             tokens: List of instrument tokens
         """
-        if not self.ticker or not self.is_connected:
-            print("⚠ Not connected")
+        if not self.tickers or not self.is_connected:
+            logger.warning("⚠ Not connected")
             return
         
-        with self.lock:
-            self.ticker.unsubscribe(tokens)
-            self.subscribed_tokens.difference_update(tokens)
-            print(f"✓ Unsubscribed from {len(tokens)} instruments")
+        self._call_in_reactor(self._unsubscribe, list(tokens))
+    
+    def _unsubscribe(self, tokens: List[int]):
+        """Drop tokens from their shards (reactor thread)"""
+        by_shard: Dict[int, List[int]] = {}
+        for token in tokens:
+            shard = self.token_to_ticker.pop(token, None)
+            if shard is not None:
+                self.shard_tokens[shard].discard(token)
+                by_shard.setdefault(shard, []).append(token)
+        
+        for shard, shard_tokens in by_shard.items():
+            self.tickers[shard].unsubscribe(shard_tokens)
+        
+        self.subscribed_tokens.difference_update(tokens)
+        self._token_list = tuple(self.subscribed_tokens)
+        logger.info("✓ Unsubscribed from %d instruments", len(tokens))
+    
+    def resubscribe(self, shard: Optional[int] = None):
+        """
+        Resubscribe to previously subscribed tokens
+        
+        Args:
+            shard: Only resubscribe this connection's tokens (default: all)
+        """
+        self._call_in_reactor(self._resubscribe, shard)
     
-    def resubscribe(self):
-        """Resubscribe to all previously subscribed tokens"""
-        if self.subscribed_tokens:
-            tokens = list(self.subscribed_tokens)
-            self.subscribe(tokens, mode="full")
+    def _resubscribe(self, shard: Optional[int]):
+        """Resubscribe shard tokens (reactor thread)"""
+        shards = range(len(self.tickers)) if shard is None else (shard,)
+        for i in shards:
+            if i < len(self.shard_tokens) and self.shard_tokens[i]:
+                self._subscribe_shard(i, list(self.shard_tokens[i]), "full")
     
     # ==================== CALLBACK REGISTRATION ====================
     
@@ -154,100 +303,238 @@ class WebSocketHandler:
     # ==================== INTERNAL CALLBACKS ====================
     
     def _on_ticks(self, ws, ticks):
-        """Handle incoming ticks"""
-        # Add timestamp if not present
+        """Handle incoming ticks (runs on the socket reader thread)"""
+        # Add timestamp if not present, one clock read per batch
+        now = datetime.now()
         for tick in ticks:
-            if 'timestamp' not in tick or not tick['timestamp']:
-                tick['timestamp'] = datetime.now()
+            if not tick.get('timestamp'):
+                tick['timestamp'] = now
+        
+        # Hand off to the dispatcher and return to the socket
+        self._enqueue(ticks)
+    
+    def _enqueue(self, item):
+        """Queue an item for the dispatcher, dropping the oldest batch if full"""
+        while True:
+            try:
+                self._tick_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    # Stale ticks are worthless; make room for the newest
+                    self._tick_queue.get_nowait()
+                    self.ticks_dropped += 1
+                except queue.Empty:
+                    pass
+    
+    def _start_dispatcher(self):
+        """Start the tick dispatch thread if it isn't running"""
+        if self._dispatch_thread and self._dispatch_thread.is_alive():
+            return
+        
+        self._dispatch_thread = threading.Thread(
+            target=self._dispatch_loop, name="tick-dispatch", daemon=True
+        )
+        self._dispatch_thread.start()
+    
+    def _stop_dispatcher(self):
+        """Stop the tick dispatch thread after it drains queued ticks"""
+        if self._dispatch_thread and self._dispatch_thread.is_alive():
+            self._enqueue(None)
+            self._dispatch_thread.join(timeout=5)
+        self._dispatch_thread = None
+    
+    def _dispatch_loop(self):
+        """Fan tick batches out to registered callbacks"""
+        while True:
+            ticks = self._tick_queue.get()
+            if ticks is None:  # Shutdown sentinel
+                break
             
-
+            if self.coalesce_ticks:
+                ticks, stop = self._coalesce(ticks)
+            else:
+                ticks, stop = self._drain(ticks)
+            
+            # Call registered callbacks
+            for callback in self.tick_callbacks:
+                try:
+                    callback(ticks)
+                except Exception as e:
+                    logger.error("✗ Error in tick callback: %s", e)
+            
+            if stop:
+                break
+    
+    def _drain(self, ticks: List[Dict]):
+        """
+        Append every batch queued behind this one, keeping all ticks in order
         
-        # Call registered callbacks
-        for callback in self.tick_callbacks:
+        When consumers fall behind, the backlog is handed to callbacks in one
+        call instead of one call per socket message.
+        
+        Args:
+            ticks: Batch already taken off the queue
+            
+        Returns:
+            (ticks, whether the shutdown sentinel was reached)
+        """
+        merged = None
+        stop = False
+        
+        while True:
             try:
-                callback(ticks)
-            except Exception as e:
-                print(f"✗ Error in tick callback: {str(e)}")
+                batch = self._tick_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if batch is None:
+                stop = True
+                break
+            
+            if merged is None:
+                merged = list(ticks)
+            merged.extend(batch)
+        
+        return (ticks if merged is None else merged), stop
+    
+    def _coalesce(self, ticks: List[Dict]):
+        """
+        Merge every queued batch into one, latest tick per instrument
+        
+        Args:
+            ticks: Batch already taken off the queue
+            
+        Returns:
+            (merged ticks, whether the shutdown sentinel was reached)
+        """
+        latest = {tick['instrument_token']: tick for tick in ticks}
+        
+        while True:
+            try:
+                batch = self._tick_queue.get_nowait()
+            except queue.Empty:
+                return list(latest.values()), False
+            
+            if batch is None:
+                return list(latest.values()), True
+            
+            for tick in batch:
+                latest[tick['instrument_token']] = tick
     
     def _on_connect(self, ws, response):
         """Handle connection"""
         self.is_connected = True
         self.reconnect_attempts = 0
         
-        print(f"✓ WebSocket connected: {response}")
+        # KiteTicker passes itself as ws; anything else resubscribes every shard
+        shard = next((i for i, t in enumerate(self.tickers) if t is ws), None)
+        logger.info("✓ WebSocket connected [%s]: %s", shard, response)
         
-        # Resubscribe to tokens
-        self.resubscribe()
+        # Resubscribe to this connection's tokens
+        self.resubscribe(shard)
         
         # Call registered callbacks
         for callback in self.connect_callbacks:
             try:
                 callback(response)
             except Exception as e:
-                print(f"✗ Error in connect callback: {str(e)}")
+                logger.error("✗ Error in connect callback: %s", e)
     
     def _on_close(self, ws, code, reason):
         """Handle disconnection"""
-        self.is_connected = False
+        self.is_connected = any(t.is_connected() for t in self.tickers if t is not ws)
         
-        print(f"⚠ WebSocket closed: {code} - {reason}")
+        logger.warning("⚠ WebSocket closed: %s - %s", code, reason)
         
         # Call registered callbacks
         for callback in self.disconnect_callbacks:
             try:
                 callback(code, reason)
             except Exception as e:
-                print(f"✗ Error in disconnect callback: {str(e)}")
-        
-        # Auto-reconnect if enabled
-        if self.auto_reconnect and self.reconnect_attempts < self.max_reconnect_attempts:
-            self._attempt_reconnect()
+                logger.error("✗ Error in disconnect callback: %s", e)
     
     def _on_error(self, ws, code, reason):
         """Handle errors"""
-        print(f"✗ WebSocket error: {code} - {reason}")
+        logger.error("✗ WebSocket error: %s - %s", code, reason)
         
         # Call registered callbacks
         for callback in self.error_callbacks:
             try:
                 callback(code, reason)
             except Exception as e:
-                print(f"✗ Error in error callback: {str(e)}")
+                logger.error("✗ Error in error callback: %s", e)
     
     def _on_reconnect(self, ws, attempts_count):
         """Handle reconnection attempt"""
-        print(f"↻ Reconnecting... (Attempt {attempts_count})")
+        logger.info("↻ Reconnecting... (Attempt %d)", attempts_count)
     
     def _on_noreconnect(self, ws):
         """Handle reconnection failure"""
-        print("✗ Reconnection failed. Max attempts reached.")
-        self.is_connected = False
+        logger.error("✗ Reconnection failed. Max attempts reached.")
+        self.is_connected = any(t.is_connected() for t in self.tickers if t is not ws)
+        
+        # KiteTicker retries dropped connections itself; take over only once
+        # it has given up, so the two never race to open duplicate sockets
+        if self.auto_reconnect:
+            self._schedule_reconnect()
     
-    def _attempt_reconnect(self):
-        """Attempt to reconnect"""
+    def _schedule_reconnect(self):
+        """Schedule the next reconnect with exponential backoff (reactor thread)"""
+        if self.reconnect_attempts >= self.max_reconnect_attempts:
+            return
+        
+        # Shards that give up together share one pending attempt
+        if self._reconnect_call is not None and self._reconnect_call.active():
+            return
+        
+        delay = min(self.max_reconnect_delay, self.reconnect_delay * 2 ** self.reconnect_attempts)
         self.reconnect_attempts += 1
         
-        print(f"Attempting reconnection in {self.reconnect_delay}s... (Attempt {self.reconnect_attempts}/{self.max_reconnect_attempts})")
+        logger.info(
+            "Attempting reconnection in %ss... (Attempt %d/%d)",
+            delay, self.reconnect_attempts, self.max_reconnect_attempts
+        )
         
-        time.sleep(self.reconnect_delay)
+        # Timer on the reactor: nothing sleeps and no stack builds up
+        self._reconnect_call = reactor.callLater(delay, self._attempt_reconnect)
+    
+    def _cancel_reconnect(self):
+        """Cancel a pending reconnect (reactor thread)"""
+        if self._reconnect_call is not None and self._reconnect_call.active():
+            self._reconnect_call.cancel()
+        self._reconnect_call = None
+    
+    def _attempt_reconnect(self):
+        """Reconnect every shard that is down (reactor thread)"""
+        self._reconnect_call = None
         
         try:
-            self.connect()
+            for ticker in self.tickers:
+                if not ticker.is_connected():
+                    ticker.connect(threaded=True)
         except Exception as e:
-            print(f"✗ Reconnection failed: {str(e)}")
-            
-            if self.reconnect_attempts < self.max_reconnect_attempts:
-                self._attempt_reconnect()
+            logger.error("✗ Reconnection failed: %s", e)
+            self._schedule_reconnect()
     
     # ==================== STATUS ====================
     
     def get_status(self) -> Dict:
-        """Get WebSocket status"""
+        """
+        Get WebSocket status
+        
+        Reads only the published token snapshot and sizes, so it never
+        waits on the reactor thread or copies the subscription set.
+        """
+        tokens = self._token_list
         return {
             "connected": self.is_connected,
-            "subscribed_tokens": list(self.subscribed_tokens),
-            "subscription_count": len(self.subscribed_tokens),
+            "connections": len(self.tickers),
+            "subscribed_tokens": tokens,
+            "subscription_count": len(tokens),
+            "tokens_per_connection": [len(s) for s in self.shard_tokens],
             "reconnect_attempts": self.reconnect_attempts,
+            "ticks_dropped": self.ticks_dropped,
             "auto_reconnect": self.auto_reconnect
         }
 
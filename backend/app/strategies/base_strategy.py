@@ -3,12 +3,16 @@ Base Strategy Framework
 Defines the interface and common functionality for all trading strategies
 """
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Dict, List
 from datetime import datetime
 import pandas as pd
 from enum import Enum
 
+from app.utils.log_utils import get_logger
+
+logger = get_logger("strategy")
+
 
 class SignalType(Enum):
     """Trading signal types"""
@@ -25,7 +29,7 @@ class PositionType(Enum):
     NONE = "NONE"
 
 
-@dataclass
+@dataclass(slots=True)
 class TradingSignal:
     """Trading signal with entry/exit details"""
     timestamp: datetime
@@ -37,10 +41,10 @@ class TradingSignal:
     target: Optional[float] = None
     reason: str = ""
     confidence: float = 1.0
-    metadata: Dict = None
+    metadata: Optional[Dict] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Active trading position"""
     symbol: str
@@ -53,9 +57,23 @@ class Position:
     current_price: float = 0.0
     pnl: float = 0.0
     order_id: Optional[str] = None
+    
+    # Cached direction so per-tick checks avoid enum comparisons
+    is_long: bool = field(init=False)
+    
+    def __post_init__(self):
+        self.is_long = self.position_type is PositionType.LONG
+        
+        # Strategies often hand over numpy scalars; per-tick comparisons
+        # and P&L maths are ~3x faster on native floats
+        self.entry_price = float(self.entry_price)
+        if self.stop_loss is not None:
+            self.stop_loss = float(self.stop_loss)
+        if self.target is not None:
+            self.target = float(self.target)
 
 
-@dataclass
+@dataclass(slots=True)
 class StrategyConfig:
     """Strategy configuration"""
     name: str
@@ -71,7 +89,21 @@ class StrategyConfig:
     max_trades_per_day: int = 10
     
     # Strategy-specific parameters
-    params: Dict = None
+    params: Optional[Dict] = None
+
+
+# Fixed signal metadata is read-only, so every signal of a kind shares one
+# dict. Consumers must copy before modifying.
+_EXIT_METADATA = {
+    "stop_loss": {"exit_type": "stop_loss"},
+    "target": {"exit_type": "target"},
+}
+UPDATE_SL_METADATA = {"action": "update_sl"}
+
+# Direction of stop-loss / target away from entry, so percentage levels
+# are entry * (1 + sign * pct) for either side
+SL_SIGN = {SignalType.BUY: -1.0, SignalType.SELL: 1.0}
+TARGET_SIGN = {SignalType.BUY: 1.0, SignalType.SELL: -1.0}
 
 
 class BaseStrategy(ABC):
@@ -88,14 +120,22 @@ class BaseStrategy(ABC):
         self.pnl_today = 0.0
         self.is_active = True
         
+        # (price, latest bar) of the last evaluated tick
+        self._last_tick = None
+        
+        # Daily limit already reported; rejected ticks stay quiet until reset
+        self._limit_warned = False
+        
     @abstractmethod
-    def generate_signal(self, df: pd.DataFrame, current_price: float) -> Optional[TradingSignal]:
+    def generate_signal(self, df: pd.DataFrame, current_price: float, current_ts: Optional[datetime] = None) -> Optional[TradingSignal]:
         """
         Generate trading signal based on strategy logic
         
         Args:
             df: Historical OHLCV data
             current_price: Current market price
+            current_ts: Time of this evaluation; backtests pass the bar time
+                (default: datetime.now())
             
         Returns:
             TradingSignal or None
@@ -158,6 +198,27 @@ class BaseStrategy(ABC):
         
         return min(quantity, max_quantity)
     
+    def _repeat_tick(self, df: pd.DataFrame, current_price: float) -> bool:
+        """
+        Check whether this tick repeats the last one evaluated
+        
+        Live feeds often resend an unchanged price. With the same price and
+        the same latest bar, a deterministic strategy would reach the same
+        result again, so callers can skip the evaluation.
+        
+        Args:
+            df: Historical OHLCV data
+            current_price: Current market price
+            
+        Returns:
+            True if price and latest bar match the previous call
+        """
+        key = (current_price, df.index[-1] if len(df) else None)
+        if key == self._last_tick:
+            return True
+        self._last_tick = key
+        return False
+    
     def check_risk_limits(self) -> bool:
         """
         Check if risk limits are breached
@@ -167,17 +228,21 @@ class BaseStrategy(ABC):
         """
         # Check daily loss limit
         if abs(self.pnl_today) >= self.config.max_loss_per_day:
-            print(f"⚠ Daily loss limit reached: ₹{self.pnl_today:.2f}")
+            if not self._limit_warned:
+                self._limit_warned = True
+                logger.warning("⚠ Daily loss limit reached: ₹%.2f", self.pnl_today)
             return False
         
         # Check daily trade limit
         if self.trades_today >= self.config.max_trades_per_day:
-            print(f"⚠ Daily trade limit reached: {self.trades_today} trades")
+            if not self._limit_warned:
+                self._limit_warned = True
+                logger.warning("⚠ Daily trade limit reached: %d trades", self.trades_today)
             return False
         
         # Check max positions
         if self.position is not None:
-            print(f"⚠ Already in position")
+            logger.debug("⚠ Already in position")
             return False
         
         return True
@@ -192,20 +257,21 @@ class BaseStrategy(ABC):
         if self.position is None:
             return
         
-        self.position.current_price = current_price
+        position = self.position
+        position.current_price = current_price
         
-        # Calculate PnL
-        if self.position.position_type == PositionType.LONG:
-            self.position.pnl = (current_price - self.position.entry_price) * self.position.quantity
-        else:  # SHORT
-            self.position.pnl = (self.position.entry_price - current_price) * self.position.quantity
+        # Calculate PnL (sign flips for SHORT)
+        sign = 1 if position.is_long else -1
+        position.pnl = sign * (current_price - position.entry_price) * position.quantity
     
-    def check_exit_conditions(self, current_price: float) -> Optional[TradingSignal]:
+    def check_exit_conditions(self, current_price: float, now: Optional[datetime] = None) -> Optional[TradingSignal]:
         """
         Check if stop-loss or target is hit
         
         Args:
             current_price: Current market price
+            now: Timestamp for the exit signal; callers that already read
+                the clock pass it in (default: datetime.now())
             
         Returns:
             EXIT signal if conditions met, None otherwise
@@ -213,59 +279,27 @@ class BaseStrategy(ABC):
         if self.position is None:
             return None
         
-        exit_signal = None
-        
-        if self.position.position_type == PositionType.LONG:
-            # Check stop-loss
-            if current_price <= self.position.stop_loss:
-                exit_signal = TradingSignal(
-                    timestamp=datetime.now(),
-                    symbol=self.config.symbol,
-                    signal_type=SignalType.EXIT,
-                    price=current_price,
-                    quantity=self.position.quantity,
-                    reason="Stop-loss hit",
-                    metadata={"exit_type": "stop_loss"}
-                )
-            
-            # Check target
-            elif current_price >= self.position.target:
-                exit_signal = TradingSignal(
-                    timestamp=datetime.now(),
-                    symbol=self.config.symbol,
-                    signal_type=SignalType.EXIT,
-                    price=current_price,
-                    quantity=self.position.quantity,
-                    reason="Target reached",
-                    metadata={"exit_type": "target"}
-                )
-        
-        else:  # SHORT position
-            # Check stop-loss
-            if current_price >= self.position.stop_loss:
-                exit_signal = TradingSignal(
-                    timestamp=datetime.now(),
-                    symbol=self.config.symbol,
-                    signal_type=SignalType.EXIT,
-                    price=current_price,
-                    quantity=self.position.quantity,
-                    reason="Stop-loss hit",
-                    metadata={"exit_type": "stop_loss"}
-                )
-            
-            # Check target
-            elif current_price <= self.position.target:
-                exit_signal = TradingSignal(
-                    timestamp=datetime.now(),
-                    symbol=self.config.symbol,
-                    signal_type=SignalType.EXIT,
-                    price=current_price,
-                    quantity=self.position.quantity,
-                    reason="Target reached",
-                    metadata={"exit_type": "target"}
-                )
-        
-        return exit_signal
+        position = self.position
+        
+        # Measure in the position's favour: SL is hit at or below zero,
+        # target at or above zero, for LONG and SHORT alike
+        sign = 1 if position.is_long else -1
+        if sign * (current_price - position.stop_loss) <= 0:
+            exit_type = "stop_loss"
+        elif sign * (current_price - position.target) >= 0:
+            exit_type = "target"
+        else:
+            return None
+        
+        return TradingSignal(
+            timestamp=now or datetime.now(),
+            symbol=self.config.symbol,
+            signal_type=SignalType.EXIT,
+            price=current_price,
+            quantity=position.quantity,
+            reason="Stop-loss hit" if exit_type == "stop_loss" else "Target reached",
+            metadata=_EXIT_METADATA[exit_type]
+        )
     
     def open_position(self, signal: TradingSignal):
         """
@@ -274,7 +308,7 @@ class BaseStrategy(ABC):
         Args:
             signal: Trading signal with entry details
         """
-        position_type = PositionType.LONG if signal.signal_type == SignalType.BUY else PositionType.SHORT
+        position_type = PositionType.LONG if signal.signal_type is SignalType.BUY else PositionType.SHORT
         
         self.position = Position(
             symbol=signal.symbol,
@@ -288,7 +322,7 @@ class BaseStrategy(ABC):
         )
         
         self.trades_today += 1
-        print(f"✓ Position opened: {position_type.value} {signal.quantity} @ ₹{signal.price:.2f}")
+        logger.info("✓ Position opened: %s %d @ ₹%.2f", position_type.value, signal.quantity, signal.price)
     
     def close_position(self, exit_price: float, reason: str = "Manual exit"):
         """
@@ -302,14 +336,12 @@ class BaseStrategy(ABC):
             return
         
         # Calculate final PnL
-        if self.position.position_type == PositionType.LONG:
-            pnl = (exit_price - self.position.entry_price) * self.position.quantity
-        else:
-            pnl = (self.position.entry_price - exit_price) * self.position.quantity
+        sign = 1 if self.position.is_long else -1
+        pnl = sign * (exit_price - self.position.entry_price) * self.position.quantity
         
         self.pnl_today += pnl
         
-        print(f"✓ Position closed: PnL = ₹{pnl:.2f} ({reason})")
+        logger.info("✓ Position closed: PnL = ₹%.2f (%s)", pnl, reason)
         
         self.position = None
     
@@ -318,6 +350,7 @@ class BaseStrategy(ABC):
         self.trades_today = 0
         self.pnl_today = 0.0
         self.is_active = True
+        self._limit_warned = False
     
     def get_status(self) -> Dict:
         """
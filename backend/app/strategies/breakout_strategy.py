@@ -4,6 +4,7 @@ Trades breakouts from support/resistance levels with volume confirmation
 """
 import pandas as pd
 import numpy as np
+import math
 from typing import Optional
 from datetime import datetime
 from app.strategies.base_strategy import (
@@ -37,18 +38,28 @@ class BreakoutStrategy(BaseStrategy):
     
     def __init__(self, config: StrategyConfig):
         super().__init__(config)
+        p = config.params or {}
         
         # Default parameters
-        self.lookback_period = config.params.get('lookback_period', 20) if config.params else 20
-        self.volume_multiplier = config.params.get('volume_multiplier', 1.2) if config.params else 1.2
-        self.min_rr_ratio = config.params.get('min_rr_ratio', 1.5) if config.params else 1.5
+        self.lookback_period = p.get('lookback_period', 20)
+        self.volume_multiplier = p.get('volume_multiplier', 1.2)
+        self.min_rr_ratio = p.get('min_rr_ratio', 1.5)
+        self.sr_refresh_seconds = p.get('sr_refresh_seconds', 30)
         
-        # Cached S/R levels
-        self.support_levels = []
-        self.resistance_levels = []
+        # Cached S/R levels, kept as sorted arrays for binary search
+        self.support_levels = np.empty(0)
+        self.resistance_levels = np.empty(0)
         self.last_sr_update = None
+        
+        # Price ranges over which the nearest resistance above / support
+        # below stay the same; empty until first looked up
+        self._res_range = (math.inf, -math.inf)
+        self._sup_range = (math.inf, -math.inf)
+        
+        # Bars in the volume average (current bar included)
+        self.volume_window = 20
     
-    def _update_sr_levels(self, df: pd.DataFrame):
+    def _update_sr_levels(self, df: pd.DataFrame, now: Optional[datetime] = None):
         """Update support and resistance levels"""
         levels = price_action_service.find_support_resistance(
             df,
@@ -57,39 +68,78 @@ class BreakoutStrategy(BaseStrategy):
             tolerance=0.02
         )
         
-        self.support_levels = [l.level for l in levels if l.type == 'support']
-        self.resistance_levels = [l.level for l in levels if l.type == 'resistance']
-        self.last_sr_update = datetime.now()
+        self.support_levels = np.sort(np.fromiter(
+            (l.level for l in levels if l.type == 'support'), dtype=np.float64
+        ))
+        self.resistance_levels = np.sort(np.fromiter(
+            (l.level for l in levels if l.type == 'resistance'), dtype=np.float64
+        ))
+        self.last_sr_update = now or datetime.now()
+        
+        self._res_range = (math.inf, -math.inf)
+        self._sup_range = (math.inf, -math.inf)
+    
+    def _resistance_above(self, price: float) -> Optional[float]:
+        """
+        Nearest resistance strictly above price
+        
+        The answer holds for every price in [level below, level above), so
+        it is only searched again once price leaves that range.
+        """
+        low, high = self._res_range
+        if not (low <= price < high):
+            levels = self.resistance_levels
+            idx = np.searchsorted(levels, price, side='right')
+            low = float(levels[idx - 1]) if idx > 0 else -math.inf
+            high = float(levels[idx]) if idx < len(levels) else math.inf
+            self._res_range = (low, high)
+        return high if high != math.inf else None
+    
+    def _support_below(self, price: float) -> Optional[float]:
+        """
+        Nearest support strictly below price
+        
+        The answer holds for every price in (level below, level above], so
+        it is only searched again once price leaves that range.
+        """
+        low, high = self._sup_range
+        if not (low < price <= high):
+            levels = self.support_levels
+            idx = np.searchsorted(levels, price, side='left')
+            low = float(levels[idx - 1]) if idx > 0 else -math.inf
+            high = float(levels[idx]) if idx < len(levels) else math.inf
+            self._sup_range = (low, high)
+        return low if low != -math.inf else None
     
-    def _find_nearest_level(self, price: float, levels: list, direction: str) -> Optional[float]:
+    def _find_nearest_level(self, price: float, levels: np.ndarray, direction: str) -> Optional[float]:
         """
         Find nearest support/resistance level
         
         Args:
             price: Current price
-            levels: List of price levels
+            levels: Sorted array of price levels
             direction: 'above' or 'below'
             
         Returns:
             Nearest level or None
         """
-        if not levels:
-            return None
-        
         if direction == 'above':
-            above_levels = [l for l in levels if l > price]
-            return min(above_levels) if above_levels else None
+            # First level strictly above price
+            idx = np.searchsorted(levels, price, side='right')
+            return float(levels[idx]) if idx < len(levels) else None
         else:  # below
-            below_levels = [l for l in levels if l < price]
-            return max(below_levels) if below_levels else None
+            # Last level strictly below price
+            idx = np.searchsorted(levels, price, side='left') - 1
+            return float(levels[idx]) if idx >= 0 else None
     
-    def generate_signal(self, df: pd.DataFrame, current_price: float) -> Optional[TradingSignal]:
+    def generate_signal(self, df: pd.DataFrame, current_price: float, current_ts: Optional[datetime] = None) -> Optional[TradingSignal]:
         """
         Generate trading signal based on breakout detection
         
         Args:
             df: Historical OHLCV data
             current_price: Current market price
+            current_ts: Time of this evaluation (default: datetime.now())
             
         Returns:
             TradingSignal or None
@@ -98,34 +148,50 @@ class BreakoutStrategy(BaseStrategy):
         if len(df) < self.lookback_period + 5:
             return None
         
+        current_ts = current_ts or datetime.now()
+        
         # Check risk limits
         if not self.check_risk_limits():
             return None
         
-        # Update S/R levels
-        self._update_sr_levels(df)
+        # Update S/R levels (they move over minutes, not ticks)
+        if (self.last_sr_update is None or
+                (current_ts - self.last_sr_update).total_seconds() >= self.sr_refresh_seconds):
+            self._update_sr_levels(df, current_ts)
+        
+        # Get latest candle; hot reads go through plain numpy views of the
+        # columns rather than pandas indexing
+        close = df['close'].to_numpy(dtype=np.float64, copy=False)
+        current_close = float(close[-1])
+        previous_close = float(close[-2])
         
-        # Calculate volume average
-        df = df.copy()
-        df['volume_avg'] = df['volume'].rolling(window=20).mean()
+        # Levels the previous close sits between; no cross, no signal
+        nearest_resistance = self._resistance_above(previous_close)
+        nearest_support = self._support_below(previous_close)
         
-        # Get latest candle
-        current = df.iloc[-1]
-        previous = df.iloc[-2]
+        if not ((nearest_resistance and current_close > nearest_resistance) or
+                (nearest_support and current_close < nearest_support)):
+            return None
+        
+        # Calculate volume average (only reached on a cross, so no running state)
+        volume = df['volume'].to_numpy(dtype=np.float64, copy=False)
+        volume_avg = (
+            float(volume[-self.volume_window:].mean())
+            if len(volume) >= self.volume_window else None
+        )
+        current_volume = float(volume[-1])
         
         # Check volume confirmation
-        volume_confirmed = current['volume'] > (current['volume_avg'] * self.volume_multiplier)
+        volume_confirmed = volume_avg is not None and current_volume > (volume_avg * self.volume_multiplier)
         
         if not volume_confirmed:
             return None
         
         # Check for resistance breakout (BUY)
-        nearest_resistance = self._find_nearest_level(previous['close'], self.resistance_levels, 'above')
-        
-        if nearest_resistance and current['close'] > nearest_resistance:
+        if nearest_resistance and current_close > nearest_resistance:
             # Breakout confirmed
             # Find next resistance for target
-            next_resistance = self._find_nearest_level(current['close'], self.resistance_levels, 'above')
+            next_resistance = self._find_nearest_level(current_close, self.resistance_levels, 'above')
             
             # Calculate stop-loss (below broken resistance)
             stop_loss = nearest_resistance * 0.995  # 0.5% below
@@ -147,7 +213,7 @@ class BreakoutStrategy(BaseStrategy):
                 
                 if quantity > 0:
                     return TradingSignal(
-                        timestamp=datetime.now(),
+                        timestamp=current_ts,
                         symbol=self.config.symbol,
                         signal_type=SignalType.BUY,
                         price=current_price,
@@ -158,18 +224,16 @@ class BreakoutStrategy(BaseStrategy):
                         confidence=0.85,
                         metadata={
                             "broken_level": nearest_resistance,
-                            "volume_ratio": current['volume'] / current['volume_avg'],
+                            "volume_ratio": current_volume / volume_avg,
                             "rr_ratio": reward / risk
                         }
                     )
         
         # Check for support breakdown (SELL)
-        nearest_support = self._find_nearest_level(previous['close'], self.support_levels, 'below')
-        
-        if nearest_support and current['close'] < nearest_support:
+        if nearest_support and current_close < nearest_support:
             # Breakdown confirmed
             # Find next support for target
-            next_support = self._find_nearest_level(current['close'], self.support_levels, 'below')
+            next_support = self._find_nearest_level(current_close, self.support_levels, 'below')
             
             # Calculate stop-loss (above broken support)
             stop_loss = nearest_support * 1.005  # 0.5% above
@@ -191,7 +255,7 @@ class BreakoutStrategy(BaseStrategy):
                 
                 if quantity > 0:
                     return TradingSignal(
-                        timestamp=datetime.now(),
+                        timestamp=current_ts,
                         symbol=self.config.symbol,
                         signal_type=SignalType.SELL,
                         price=current_price,
@@ -202,7 +266,7 @@ class BreakoutStrategy(BaseStrategy):
                         confidence=0.85,
                         metadata={
                             "broken_level": nearest_support,
-                            "volume_ratio": current['volume'] / current['volume_avg'],
+                            "volume_ratio": current_volume / volume_avg,
                             "rr_ratio": reward / risk
                         }
                     )
@@ -221,7 +285,7 @@ class BreakoutStrategy(BaseStrategy):
         Returns:
             Stop-loss price
         """
-        if signal_type == SignalType.BUY:
+        if signal_type is SignalType.BUY:
             return entry_price * 0.98  # 2% below
         else:
             return entry_price * 1.02  # 2% above
@@ -238,7 +302,7 @@ class BreakoutStrategy(BaseStrategy):
         Returns:
             Target price
         """
-        if signal_type == SignalType.BUY:
+        if signal_type is SignalType.BUY:
             return entry_price * 1.03  # 3% above
         else:
             return entry_price * 0.97  # 3% below
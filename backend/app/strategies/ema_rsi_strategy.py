@@ -2,13 +2,14 @@
 Strategy 1: EMA + RSI Indicator-Based Strategy
 Combines EMA crossover with RSI for trend-following entries
 """
+import math
 import pandas as pd
-from typing import Optional
+from typing import Optional, Tuple
 from datetime import datetime
 from app.strategies.base_strategy import (
-    BaseStrategy, StrategyConfig, TradingSignal, SignalType
+    BaseStrategy, StrategyConfig, TradingSignal, SignalType,
+    SL_SIGN, TARGET_SIGN
 )
-from app.services.indicators import TechnicalIndicators
 
 
 class EMA_RSI_Strategy(BaseStrategy):
@@ -35,25 +36,91 @@ class EMA_RSI_Strategy(BaseStrategy):
     
     def __init__(self, config: StrategyConfig):
         super().__init__(config)
+        p = config.params or {}
         
         # Default parameters
-        self.fast_ema = config.params.get('fast_ema', 9) if config.params else 9
-        self.slow_ema = config.params.get('slow_ema', 21) if config.params else 21
-        self.rsi_period = config.params.get('rsi_period', 14) if config.params else 14
-        self.rsi_overbought = config.params.get('rsi_overbought', 70) if config.params else 70
-        self.rsi_oversold = config.params.get('rsi_oversold', 30) if config.params else 30
+        self.fast_ema = p.get('fast_ema', 9)
+        self.slow_ema = p.get('slow_ema', 21)
+        self.rsi_period = p.get('rsi_period', 14)
+        self.rsi_overbought = p.get('rsi_overbought', 70)
+        self.rsi_oversold = p.get('rsi_oversold', 30)
         
         # Stop-loss and target percentages
-        self.stop_loss_pct = config.params.get('stop_loss_pct', 0.02) if config.params else 0.02  # 2%
-        self.target_pct = config.params.get('target_pct', 0.04) if config.params else 0.04  # 4% (1:2 RR)
+        self.stop_loss_pct = p.get('stop_loss_pct', 0.02)  # 2%
+        self.target_pct = p.get('target_pct', 0.04)  # 4% (1:2 RR)
+        
+        # Incremental indicator state: (ema_fast, ema_slow, avg_gain, avg_loss,
+        # close) as of the last closed bar; the forming bar is folded in per call
+        self._alpha_fast = 2 / (self.fast_ema + 1)
+        self._alpha_slow = 2 / (self.slow_ema + 1)
+        self._alpha_rsi = 1 / self.rsi_period
+        self._state: Optional[Tuple[float, float, float, float, float]] = None
+        self._state_bar = None
     
-    def generate_signal(self, df: pd.DataFrame, current_price: float) -> Optional[TradingSignal]:
+    def _advance(self, state: Tuple[float, float, float, float, float], close: float) -> Tuple[float, float, float, float, float]:
+        """
+        Fold one close into the EMA/RSI state
+        
+        Same recursions as TechnicalIndicators.ema and rsi_ema
+        (ewm with adjust=False).
+        """
+        ema_fast, ema_slow, avg_gain, avg_loss, last_close = state
+        a_fast, a_slow, a_rsi = self._alpha_fast, self._alpha_slow, self._alpha_rsi
+        
+        delta = close - last_close
+        return (
+            a_fast * close + (1 - a_fast) * ema_fast,
+            a_slow * close + (1 - a_slow) * ema_slow,
+            a_rsi * (delta if delta > 0 else 0.0) + (1 - a_rsi) * avg_gain,
+            a_rsi * (-delta if delta < 0 else 0.0) + (1 - a_rsi) * avg_loss,
+            close
+        )
+    
+    def _indicators(self, df: pd.DataFrame) -> Tuple[float, float, float, float, float]:
+        """
+        EMA values for the previous and current bar plus current RSI
+        
+        Only advances the stored state when a bar closes; a refetch that
+        doesn't continue from the stored bar reseeds from history.
+        
+        Returns:
+            (prev_fast, prev_slow, curr_fast, curr_slow, curr_rsi)
+        """
+        # Plain numpy view of the closes; no pandas indexing below
+        close = df['close'].to_numpy(dtype=float, copy=False)
+        bars = df.index
+        
+        if self._state_bar is None or bars[-2] != self._state_bar:
+            if self._state_bar is not None and bars[-3] == self._state_bar:
+                # One more bar closed
+                self._state = self._advance(self._state, float(close[-2]))
+            else:
+                # Seed from every closed bar
+                closes = close[:-1].tolist()
+                state = (closes[0], closes[0], 0.0, 0.0, closes[0])
+                for x in closes[1:]:
+                    state = self._advance(state, x)
+                self._state = state
+            self._state_bar = bars[-2]
+        
+        prev_fast, prev_slow = self._state[0], self._state[1]
+        curr_fast, curr_slow, avg_gain, avg_loss, _ = self._advance(self._state, float(close[-1]))
+        
+        if avg_loss:
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+        else:
+            rsi = 100.0 if avg_gain else math.nan
+        
+        return prev_fast, prev_slow, curr_fast, curr_slow, rsi
+    
+    def generate_signal(self, df: pd.DataFrame, current_price: float, current_ts: Optional[datetime] = None) -> Optional[TradingSignal]:
         """
         Generate trading signal based on EMA crossover and RSI
         
         Args:
             df: Historical OHLCV data with at least 50 candles
             current_price: Current market price
+            current_ts: Time of this evaluation (default: datetime.now())
             
         Returns:
             TradingSignal or None
@@ -66,68 +133,61 @@ class EMA_RSI_Strategy(BaseStrategy):
         if not self.check_risk_limits():
             return None
         
-        # Calculate indicators
-        df = df.copy()
-        df['ema_fast'] = TechnicalIndicators.ema(df['close'], self.fast_ema)
-        df['ema_slow'] = TechnicalIndicators.ema(df['close'], self.slow_ema)
-        df['rsi'] = TechnicalIndicators.rsi_ema(df['close'], self.rsi_period)
-        
-        # Get latest values
-        current = df.iloc[-1]
-        previous = df.iloc[-2]
+        # Calculate indicators (incrementally, see _indicators)
+        prev_fast, prev_slow, ema_fast, ema_slow, rsi = self._indicators(df)
         
         # Check for EMA crossover
-        bullish_cross = (previous['ema_fast'] <= previous['ema_slow'] and 
-                        current['ema_fast'] > current['ema_slow'])
+        bullish_cross = (prev_fast <= prev_slow and 
+                        ema_fast > ema_slow)
         
-        bearish_cross = (previous['ema_fast'] >= previous['ema_slow'] and 
-                        current['ema_fast'] < current['ema_slow'])
+        bearish_cross = (prev_fast >= prev_slow and 
+                        ema_fast < ema_slow)
         
         # Generate BUY signal
-        if bullish_cross and current['rsi'] < self.rsi_overbought:
+        if bullish_cross and rsi < self.rsi_overbought:
             stop_loss = self.calculate_stop_loss(current_price, SignalType.BUY)
             target = self.calculate_target(current_price, SignalType.BUY)
             quantity = self.calculate_position_size(current_price, stop_loss)
             
             if quantity > 0:
                 return TradingSignal(
-                    timestamp=datetime.now(),
+                    timestamp=current_ts or datetime.now(),
                     symbol=self.config.symbol,
                     signal_type=SignalType.BUY,
                     price=current_price,
                     quantity=quantity,
                     stop_loss=stop_loss,
                     target=target,
-                    reason=f"EMA bullish crossover + RSI {current['rsi']:.1f}",
+                    reason=f"EMA bullish crossover + RSI {rsi:.1f}",
                     confidence=0.8,
                     metadata={
-                        "ema_fast": current['ema_fast'],
-                        "ema_slow": current['ema_slow'],
-                        "rsi": current['rsi']
+                        "ema_fast": ema_fast,
+                        "ema_slow": ema_slow,
+                        "rsi": rsi
                     }
                 )
         
         # Generate SELL signal
-        elif bearish_cross and current['rsi'] > self.rsi_oversold:
+        elif bearish_cross and rsi > self.rsi_oversold:
             stop_loss = self.calculate_stop_loss(current_price, SignalType.SELL)
             target = self.calculate_target(current_price, SignalType.SELL)
             quantity = self.calculate_position_size(current_price, stop_loss)
             
             if quantity > 0:
                 return TradingSignal(
-                    timestamp=datetime.now(),
+                    timestamp=current_ts or datetime.now(),
                     symbol=self.config.symbol,
                     signal_type=SignalType.SELL,
                     price=current_price,
                     quantity=quantity,
                     stop_loss=stop_loss,
                     target=target,
-                    reason=f"EMA bearish crossover + RSI {current['rsi']:.1f}",
+                    reason=f"EMA bearish crossover + RSI {rsi:.1f}",
                     confidence=0.8,
                     metadata={
-                        "ema_fast": current['ema_fast'],
-                        "ema_slow": current['ema_slow'],
-                        "rsi": current['rsi']
+                        "ema_fast": ema_fast,
+                        "ema_slow": ema_slow,
+                        "rsi": rsi
                     }
                 )
         
@@ -144,10 +204,7 @@ class EMA_RSI_Strategy(BaseStrategy):
         Returns:
             Stop-loss price
         """
-        if signal_type == SignalType.BUY:
-            return entry_price * (1 - self.stop_loss_pct)
-        else:  # SELL
-            return entry_price * (1 + self.stop_loss_pct)
+        return entry_price * (1 + SL_SIGN[signal_type] * self.stop_loss_pct)
     
     def calculate_target(self, entry_price: float, signal_type: SignalType) -> float:
         """
@@ -160,7 +217,4 @@ class EMA_RSI_Strategy(BaseStrategy):
         Returns:
             Target price
         """
-        if signal_type == SignalType.BUY:
-            return entry_price * (1 + self.target_pct)
-        else:  # SELL
-            return entry_price * (1 - self.target_pct)
+        return entry_price * (1 + TARGET_SIGN[signal_type] * self.target_pct)
@@ -6,10 +6,17 @@ import pandas as pd
 from typing import Optional
 from datetime import datetime
 from app.strategies.base_strategy import (
-    BaseStrategy, StrategyConfig, TradingSignal, SignalType
+    BaseStrategy, StrategyConfig, TradingSignal, SignalType,
+    SL_SIGN, TARGET_SIGN
 )
 from app.services.indicators import TechnicalIndicators # Assuming this exists or I'll use pandas_ta if needed
 
+try:
+    import numba  # noqa: F401 - enables pandas' numba ewm engine
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 class EMAScalpingStrategy(BaseStrategy):
     """
     9/21 EMA Scalping Strategy
@@ -24,12 +31,26 @@ class EMAScalpingStrategy(BaseStrategy):
     
     def __init__(self, config: StrategyConfig):
         super().__init__(config)
-        self.fast_period = config.params.get('fast_period', 9)
-        self.slow_period = config.params.get('slow_period', 21)
-        self.sl_pct = config.params.get('sl_pct', 0.005) # 0.5% SL
-        self.target_pct = config.params.get('target_pct', 0.01) # 1.0% Target
+        p = config.params or {}
+        self.fast_period = p.get('fast_period', 9)
+        self.slow_period = p.get('slow_period', 21)
+        self.sl_pct = p.get('sl_pct', 0.005) # 0.5% SL
+        self.target_pct = p.get('target_pct', 0.01) # 1.0% Target
+        
+        # Route the EMA warm-up through pandas' numba kernel when available
+        self.use_numba_ewm = p.get('use_numba_ewm', True) and NUMBA_AVAILABLE
+        self._ewm_kwargs = (
+            {'engine': 'numba', 'engine_kwargs': {'nopython': True, 'nogil': True}}
+            if self.use_numba_ewm else {}
+        )
     
-    def generate_signal(self, df: pd.DataFrame, current_price: float) -> Optional[TradingSignal]:
+    def generate_signal(self, df: pd.DataFrame, current_price: float, current_ts: Optional[datetime] = None) -> Optional[TradingSignal]:
+        # Unchanged price on the same bar: nothing new to evaluate
+        if self._repeat_tick(df, current_price):
+            return None
+        
+        timestamp = current_ts or datetime.now()
+        
         # 1. Update Position
         self.update_position(current_price)
         
@@ -38,7 +59,7 @@ class EMAScalpingStrategy(BaseStrategy):
             return None
             
         # 3. Exit check
-        exit_signal = self.check_exit_conditions(current_price)
+        exit_signal = self.check_exit_conditions(current_price, timestamp)
         if exit_signal:
             return exit_signal
             
@@ -51,16 +72,16 @@ class EMAScalpingStrategy(BaseStrategy):
             
         # Calculate EMAs
         # Using pandas ewm if TechnicalIndicators not fully robust, but let's assume simple calculation
-        df['ema_fast'] = df['close'].ewm(span=self.fast_period, adjust=False).mean()
-        df['ema_slow'] = df['close'].ewm(span=self.slow_period, adjust=False).mean()
-        
-        curr = df.iloc[-1]
-        prev = df.iloc[-2]
+        close = df['close']
+        ema_fast = close.ewm(span=self.fast_period, adjust=False).mean(**self._ewm_kwargs).to_numpy()
+        ema_slow = close.ewm(span=self.slow_period, adjust=False).mean(**self._ewm_kwargs).to_numpy()
         
-        timestamp = datetime.now()
+        # Scalar reads off the arrays; no per-row Series boxing
+        curr_fast, prev_fast = ema_fast[-1], ema_fast[-2]
+        curr_slow, prev_slow = ema_slow[-1], ema_slow[-2]
         
         # Buy Cross
-        if prev['ema_fast'] <= prev['ema_slow'] and curr['ema_fast'] > curr['ema_slow']:
+        if prev_fast <= prev_slow and curr_fast > curr_slow:
             return TradingSignal(
                 timestamp=timestamp,
                 symbol=self.config.symbol,
@@ -74,7 +95,7 @@ class EMAScalpingStrategy(BaseStrategy):
             )
             
         # Sell Cross
-        elif prev['ema_fast'] >= prev['ema_slow'] and curr['ema_fast'] < curr['ema_slow']:
+        elif prev_fast >= prev_slow and curr_fast < curr_slow:
             return TradingSignal(
                 timestamp=timestamp,
                 symbol=self.config.symbol,
@@ -90,13 +111,7 @@ class EMAScalpingStrategy(BaseStrategy):
         return None
 
     def calculate_stop_loss(self, entry_price: float, signal_type: SignalType) -> float:
-        if signal_type == SignalType.BUY:
-            return entry_price * (1 - self.sl_pct)
-        else:
-            return entry_price * (1 + self.sl_pct)
+        return entry_price * (1 + SL_SIGN[signal_type] * self.sl_pct)
 
     def calculate_target(self, entry_price: float, signal_type: SignalType) -> float:
-        if signal_type == SignalType.BUY:
-            return entry_price * (1 + self.target_pct)
-        else:
-            return entry_price * (1 - self.target_pct)
+        return entry_price * (1 + TARGET_SIGN[signal_type] * self.target_pct)
@@ -3,11 +3,16 @@ Opening Range Breakout (ORB) Strategy
 Trades the breakout of the first N-minute candle.
 """
 import pandas as pd
+import numpy as np
 from typing import Optional
 from datetime import datetime, time
 from app.strategies.base_strategy import (
-    BaseStrategy, StrategyConfig, TradingSignal, SignalType
+    BaseStrategy, StrategyConfig, TradingSignal, SignalType,
+    SL_SIGN, TARGET_SIGN
 )
+from app.utils.log_utils import get_logger
+
+logger = get_logger("strategy")
 
 class ORBStrategy(BaseStrategy):
     """
@@ -20,26 +25,44 @@ class ORBStrategy(BaseStrategy):
     
     def __init__(self, config: StrategyConfig):
         super().__init__(config)
-        self.range_minutes = config.params.get('range_minutes', 15)
-        self.sl_pct = config.params.get('sl_pct', 0.005)
-        self.target_pct = config.params.get('target_pct', 0.01)
+        p = config.params or {}
+        self.range_minutes = p.get('range_minutes', 15)
+        self.sl_pct = p.get('sl_pct', 0.005)
+        self.target_pct = p.get('target_pct', 0.01)
         
         self.range_high = None
         self.range_low = None
         self.range_set = False
         
-    def generate_signal(self, df: pd.DataFrame, current_price: float) -> Optional[TradingSignal]:
+        # Opening range window, fixed for the session
+        self._start_time = time(9, 15)
+        self._range_end_time = (
+            datetime.combine(datetime.today(), self._start_time) + pd.Timedelta(minutes=self.range_minutes)
+        ).time()
+        
+    def generate_signal(self, df: pd.DataFrame, current_price: float, current_ts: Optional[datetime] = None) -> Optional[TradingSignal]:
+        # Once the range is fixed the outcome depends only on price and
+        # position, so a repeated tick can be skipped
+        if self._repeat_tick(df, current_price) and self.range_set:
+            return None
+        
+        timestamp = current_ts or datetime.now()
+        
         self.update_position(current_price)
         
         if not self.check_risk_limits():
             return None
             
-        exit_signal = self.check_exit_conditions(current_price)
+        exit_signal = self.check_exit_conditions(current_price, timestamp)
         if exit_signal:
             return exit_signal
             
         if self.position is not None:
             return None
+        
+        # Range still forming: nothing to compute or trade yet
+        if not self.range_set and timestamp.time() < self._range_end_time:
+            return None
             
         # Determine Range (Simplified Logic for Intraday Data)
         # In a real system, we'd check timestamps. 
@@ -52,15 +75,6 @@ class ORBStrategy(BaseStrategy):
             # If df doesn't have timestamps easy to parse, we might need robust logic.
             # For now, let's look at the first X candles of the DataFrame if it represents "today"
             
-            # Better approach: Use time check
-            now = datetime.now().time()
-            start_time = time(9, 15)
-            range_end_time = (datetime.combine(datetime.today(), start_time) + pd.Timedelta(minutes=self.range_minutes)).time()
-            
-            if now < range_end_time:
-                # Still forming range
-                return None
-            
             # Range is formed. Calculate High/Low of the opening range
             # Filtering DF for time between 9:15 and range_end_time
             # This requires df index to be datetime or a 'date' column
@@ -76,27 +90,34 @@ class ORBStrategy(BaseStrategy):
             # Let's try to parse index
             try:
                 if isinstance(df.index, pd.DatetimeIndex):
-                    today = datetime.now().date()
-                    todays_data = df[df.index.date == today]
+                    # Partial-string slicing binary-searches a sorted index
+                    # (and raises on an unsorted one); the monotonic flag is
+                    # cached on the index, so the check is free after the first call
+                    if not df.index.is_monotonic_increasing:
+                        df = df.sort_index()
+                    
+                    # Empty if today has no bars yet
+                    today = str(timestamp.date())
+                    todays_data = df.loc[today:today]
                     
                     # Filter for opening range
-                    mask = (todays_data.index.time >= start_time) & (todays_data.index.time < range_end_time)
-                    range_data = todays_data[mask]
+                    range_data = todays_data.between_time(
+                        self._start_time, self._range_end_time, inclusive='left'
+                    )
                     
                     if not range_data.empty:
-                        self.range_high = range_data['high'].max()
-                        self.range_low = range_data['low'].min()
+                        # Reduce straight over the column arrays, skipping
+                        # NaNs like the pandas reductions did
+                        self.range_high = float(np.nanmax(range_data['high'].to_numpy()))
+                        self.range_low = float(np.nanmin(range_data['low'].to_numpy()))
                         self.range_set = True
-                        print(f"[{self.config.symbol}] ORB Set: {self.range_low} - {self.range_high}")
+                        logger.debug("[%s] ORB Set: %.2f - %.2f", self.config.symbol, self.range_low, self.range_high)
             except Exception as e:
                 # Fallback logic if index isn't datetime or other issue
-                print(f"ORB Error: {e}")
-                pass
+                logger.warning("ORB Error: %s", e)
                 
         if not self.range_set:
              return None
-             
-        timestamp = datetime.now()
         
         # Breakout Signals
         if current_price > self.range_high:
@@ -129,13 +150,7 @@ class ORBStrategy(BaseStrategy):
 
     def calculate_stop_loss(self, entry_price: float, signal_type: SignalType) -> float:
         # Fallback if not set in generate_signal
-        if signal_type == SignalType.BUY:
-            return entry_price * (1 - self.sl_pct)
-        else:
-            return entry_price * (1 + self.sl_pct)
+        return entry_price * (1 + SL_SIGN[signal_type] * self.sl_pct)
 
     def calculate_target(self, entry_price: float, signal_type: SignalType) -> float:
-        if signal_type == SignalType.BUY:
-            return entry_price * (1 + self.target_pct)
-        else:
-            return entry_price * (1 - self.target_pct)
+        return entry_price * (1 + TARGET_SIGN[signal_type] * self.target_pct)
@@ -6,7 +6,8 @@ import pandas as pd
 from typing import Optional
 from datetime import datetime
 from app.strategies.base_strategy import (
-    BaseStrategy, StrategyConfig, TradingSignal, SignalType
+    BaseStrategy, StrategyConfig, TradingSignal, SignalType,
+    SL_SIGN, TARGET_SIGN
 )
 from app.services.pattern_scanner import pattern_scanner
 from app.services.price_action import price_action_service
@@ -46,12 +47,13 @@ class PatternConfirmationStrategy(BaseStrategy):
     
     def __init__(self, config: StrategyConfig):
         super().__init__(config)
+        p = config.params or {}
         
         # Default parameters
-        self.min_confidence = config.params.get('min_confidence', 0.80) if config.params else 0.80
-        self.trend_ema = config.params.get('trend_ema', 50) if config.params else 50
-        self.min_adx = config.params.get('min_adx', 20) if config.params else 20
-        self.min_rr_ratio = config.params.get('min_rr_ratio', 2.0) if config.params else 2.0
+        self.min_confidence = p.get('min_confidence', 0.80)
+        self.trend_ema = p.get('trend_ema', 50)
+        self.min_adx = p.get('min_adx', 20)
+        self.min_rr_ratio = p.get('min_rr_ratio', 2.0)
         
         # Patterns to trade
         self.bullish_patterns = [
@@ -60,6 +62,57 @@ class PatternConfirmationStrategy(BaseStrategy):
         self.bearish_patterns = [
             'evening_star', 'bearish_engulfing', 'shooting_star', 'dark_cloud_cover'
         ]
+        self._bullish_set = frozenset(p.lower() for p in self.bullish_patterns)
+        self._bearish_set = frozenset(p.lower() for p in self.bearish_patterns)
+        
+        self.swing_lookback = p.get('swing_lookback', 10)
+        
+        # Pattern scan and trend values only change with the latest bar, so
+        # they are kept per (bar timestamp, bar close) across ticks
+        self._pattern_cache = (None, None)
+        self._trend_cache = (None, None)
+    
+    def _bar_key(self, df: pd.DataFrame) -> tuple:
+        """Identity of the latest bar: its timestamp and close"""
+        return df.index[-1], df['close'].to_numpy()[-1]
+    
+    def _trend_values(self, df: pd.DataFrame) -> tuple:
+        """
+        Trend and swing readings for the latest bar, computed once per bar
+        
+        Reads the high/low/close columns once and derives everything the
+        entry logic needs from them.
+        
+        Args:
+            df: Historical data
+            
+        Returns:
+            (close, trend_ema, adx, swing_high, swing_low)
+        """
+        bar = self._bar_key(df)
+        if self._trend_cache[0] == bar:
+            return self._trend_cache[1]
+        
+        high = df['high'].to_numpy(copy=False)
+        low = df['low'].to_numpy(copy=False)
+        close = df['close']
+        
+        # Trend EMA and ADX
+        ema = TechnicalIndicators.ema(close, self.trend_ema).to_numpy()
+        adx, plus_di, minus_di = TechnicalIndicators.adx(df)
+        
+        # Swing extremes over the recent tail
+        lookback = self.swing_lookback
+        
+        values = (
+            close.to_numpy()[-1],
+            ema[-1],
+            adx.to_numpy()[-1],
+            high[-lookback:].max(),
+            low[-lookback:].min()
+        )
+        self._trend_cache = (bar, values)
+        return values
     
     def _check_trend_confirmation(self, df: pd.DataFrame, direction: str) -> bool:
         """
@@ -72,14 +125,7 @@ class PatternConfirmationStrategy(BaseStrategy):
         Returns:
             True if trend confirmed
         """
-        # Calculate EMA
-        ema = TechnicalIndicators.ema(df['close'], self.trend_ema)
-        current_price = df['close'].iloc[-1]
-        current_ema = ema.iloc[-1]
-        
-        # Calculate ADX for trend strength
-        adx, plus_di, minus_di = TechnicalIndicators.adx(df)
-        current_adx = adx.iloc[-1]
+        current_price, current_ema, current_adx, _, _ = self._trend_values(df)
         
         # Check trend strength
         if current_adx < self.min_adx:
@@ -91,30 +137,14 @@ class PatternConfirmationStrategy(BaseStrategy):
         else:  # bearish
             return current_price < current_ema
     
-    def _find_swing_high_low(self, df: pd.DataFrame, lookback: int = 10) -> tuple:
-        """
-        Find recent swing high and low
-        
-        Args:
-            df: Historical data
-            lookback: Lookback period
-            
-        Returns:
-            (swing_high, swing_low)
-        """
-        recent = df.tail(lookback)
-        swing_high = recent['high'].max()
-        swing_low = recent['low'].min()
-        
-        return swing_high, swing_low
-    
-    def generate_signal(self, df: pd.DataFrame, current_price: float) -> Optional[TradingSignal]:
+    def generate_signal(self, df: pd.DataFrame, current_price: float, current_ts: Optional[datetime] = None) -> Optional[TradingSignal]:
         """
         Generate trading signal based on candlestick patterns
         
         Args:
             df: Historical OHLCV data
             current_price: Current market price
+            current_ts: Time of this evaluation (default: datetime.now())
             
         Returns:
             TradingSignal or None
@@ -123,12 +153,21 @@ class PatternConfirmationStrategy(BaseStrategy):
         if len(df) < self.trend_ema + 20:
             return None
         
+        # Unchanged price on the same bar: nothing new to evaluate
+        if self._repeat_tick(df, current_price):
+            return None
+        
         # Check risk limits
         if not self.check_risk_limits():
             return None
         
-        # Scan for patterns in recent candles
-        recent_patterns = pattern_scanner.scan_latest(df, self.config.symbol, lookback=5)
+        # Scan for patterns in recent candles (once per bar)
+        bar = self._bar_key(df)
+        if self._pattern_cache[0] == bar:
+            recent_patterns = self._pattern_cache[1]
+        else:
+            recent_patterns = pattern_scanner.scan_latest(df, self.config.symbol, lookback=5)
+            self._pattern_cache = (bar, recent_patterns)
         
         if not recent_patterns:
             return None
@@ -141,15 +180,16 @@ class PatternConfirmationStrategy(BaseStrategy):
         
         # Get the most recent high-confidence pattern
         latest_pattern = high_conf_patterns[-1]
+        name = latest_pattern.pattern.lower().replace(' ', '_')
         
         # Check for bullish patterns
-        if latest_pattern.direction == 'bullish' and latest_pattern.pattern.lower().replace(' ', '_') in [p.lower() for p in self.bullish_patterns]:
+        if latest_pattern.direction == 'bullish' and name in self._bullish_set:
             # Check trend confirmation
             if not self._check_trend_confirmation(df, 'bullish'):
                 return None
             
             # Find swing low for stop-loss
-            swing_high, swing_low = self._find_swing_high_low(df)
+            _, _, _, swing_high, swing_low = self._trend_values(df)
             
             # Calculate stop-loss (below recent swing low)
             stop_loss = swing_low * 0.995  # 0.5% buffer
@@ -171,7 +211,7 @@ class PatternConfirmationStrategy(BaseStrategy):
                 
                 if quantity > 0:
                     return TradingSignal(
-                        timestamp=datetime.now(),
+                        timestamp=current_ts or datetime.now(),
                         symbol=self.config.symbol,
                         signal_type=SignalType.BUY,
                         price=current_price,
@@ -190,13 +230,13 @@ class PatternConfirmationStrategy(BaseStrategy):
                     )
         
         # Check for bearish patterns
-        elif latest_pattern.direction == 'bearish' and latest_pattern.pattern.lower().replace(' ', '_') in [p.lower() for p in self.bearish_patterns]:
+        elif latest_pattern.direction == 'bearish' and name in self._bearish_set:
             # Check trend confirmation
             if not self._check_trend_confirmation(df, 'bearish'):
                 return None
             
             # Find swing high for stop-loss
-            swing_high, swing_low = self._find_swing_high_low(df)
+            _, _, _, swing_high, swing_low = self._trend_values(df)
             
             # Calculate stop-loss (above recent swing high)
             stop_loss = swing_high * 1.005  # 0.5% buffer
@@ -218,7 +258,7 @@ class PatternConfirmationStrategy(BaseStrategy):
                 
                 if quantity > 0:
                     return TradingSignal(
-                        timestamp=datetime.now(),
+                        timestamp=current_ts or datetime.now(),
                         symbol=self.config.symbol,
                         signal_type=SignalType.SELL,
                         price=current_price,
@@ -250,10 +290,7 @@ class PatternConfirmationStrategy(BaseStrategy):
         Returns:
             Stop-loss price
         """
-        if signal_type == SignalType.BUY:
-            return entry_price * 0.98  # 2% below
-        else:
-            return entry_price * 1.02  # 2% above
+        return entry_price * (1 + SL_SIGN[signal_type] * 0.02)  # 2% away
     
     def calculate_target(self, entry_price: float, signal_type: SignalType) -> float:
         """
@@ -270,7 +307,4 @@ class PatternConfirmationStrategy(BaseStrategy):
         stop_loss = self.calculate_stop_loss(entry_price, signal_type)
         risk = abs(entry_price - stop_loss)
         
-        if signal_type == SignalType.BUY:
-            return entry_price + (risk * self.min_rr_ratio)
-        else:
-            return entry_price - (risk * self.min_rr_ratio)
+        return entry_price + TARGET_SIGN[signal_type] * risk * self.min_rr_ratio
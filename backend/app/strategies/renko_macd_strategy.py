@@ -9,23 +9,67 @@ Strategy Logic:
 - SELL when: MACD bearish AND Renko shows strong downtrend (≤-2 bricks)
 - Stop-loss based on Renko brick limits
 """
+import logging
 from typing import Optional, Dict, List
 import pandas as pd
 import numpy as np
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from app.strategies.base_strategy import (
     BaseStrategy, TradingSignal, Position, StrategyConfig,
-    SignalType, PositionType
+    SignalType, SL_SIGN, TARGET_SIGN, UPDATE_SL_METADATA
 )
 from app.services.indicators import TechnicalIndicators
 from app.services.renko import renko_calculator
 from app.services.market_data import market_data_service
+from app.utils.log_utils import get_logger
+
+logger = get_logger("strategy")
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _macd_loop(closes, a_fast: float, a_slow: float, a_signal: float,
+               fast: float, slow: float, signal: float):
+    """
+    Fold closes into the MACD EMA state
+    
+    Same recursions as TechnicalIndicators.macd (ewm with adjust=False),
+    kept as scalars so no intermediate series are built.
+    
+    Returns:
+        (fast_ema, slow_ema, signal_ema) after the last close
+    """
+    for x in closes:
+        fast = a_fast * x + (1 - a_fast) * fast
+        slow = a_slow * x + (1 - a_slow) * slow
+        signal = a_signal * (fast - slow) + (1 - a_signal) * signal
+    return fast, slow, signal
+
+
+# Compiled when numba is installed (eagerly, so the first tick pays no JIT);
+# the plain loop (fed a list) otherwise
+if NUMBA_AVAILABLE:
+    _macd_loop = njit(
+        "UniTuple(float64, 3)(float64[:], float64, float64, float64, "
+        "float64, float64, float64)",
+        cache=True, fastmath=True
+    )(_macd_loop)
 
 
 class RenkoMACDStrategyConfig(StrategyConfig):
     """Configuration for Renko + MACD Strategy"""
     
+    # StrategyConfig is slotted; keep the subclass free of a per-instance __dict__
+    __slots__ = (
+        'renko_brick_threshold', 'atr_period', 'atr_multiplier',
+        'macd_fast', 'macd_slow', 'macd_signal'
+    )
+    
     def __init__(
         self,
         symbol: str,
@@ -64,12 +108,49 @@ class RenkoMACDStrategy(BaseStrategy):
     Designed for real-time tick data processing.
     """
     
+    # Status block reported before the first brick exists; get_status
+    # hands out a copy, since callers may modify what they receive
+    _EMPTY_RENKO = {
+        'brick_count': 0,
+        'brick_size': 0,
+        'upper_limit': None,
+        'lower_limit': None
+    }
+    
+    # MACD direction (+1 bullish, -1 bearish) -> entry side
+    _CROSSOVER = {1: "bullish", -1: "bearish"}
+    _SIGTYPE = {1: SignalType.BUY, -1: SignalType.SELL}
+    _SL_ATTR = {1: 'lower_limit', -1: 'upper_limit'}
+    _BRICK_COLOR = {1: "green", -1: "red"}
+    
     def __init__(self, config: RenkoMACDStrategyConfig):
         super().__init__(config)
         self.config: RenkoMACDStrategyConfig = config
         
+        # Config values read on every tick, resolved once
+        self._symbol = config.symbol
+        self._capital = config.capital
+        self._brick_threshold = config.renko_brick_threshold
+        self._macd_min_len = config.macd_slow + config.macd_signal
+        
         # Track MACD crossover status
         self.macd_crossover = None  # "bullish", "bearish", or None
+        self._macd_dir = 0  # Same as +1 / -1 / 0 for the entry checks
+        
+        # Incremental MACD: (fast_ema, slow_ema, signal_ema) as of the last
+        # closed bar; the forming bar is folded in per call
+        self._macd_alphas = (
+            2 / (config.macd_fast + 1),
+            2 / (config.macd_slow + 1),
+            2 / (config.macd_signal + 1)
+        )
+        self._macd_state = None
+        self._macd_bar = None
+        self._macd_tick = None  # (bar, close) of the last evaluation
+        
+        # Last (price, quantity) sized from capital
+        self._qty_price = None
+        self._qty = 0
         
         # Initialize renko calculator
         self.renko = renko_calculator
@@ -80,23 +161,28 @@ class RenkoMACDStrategy(BaseStrategy):
     def _initialize_brick_size(self):
         """Calculate optimal brick size based on ATR"""
         try:
-            # Fetch historical data for ATR calculation
+            # Fetch historical data for ATR calculation (last 60 days)
+            to_date = datetime.now()
             df = market_data_service.get_historical_data_by_symbol(
                 symbol=self.config.symbol,
                 exchange=self.config.exchange,
-                interval="60minute",
-                days_back=60
+                from_date=to_date - timedelta(days=60),
+                to_date=to_date,
+                interval="60minute"
             )
             
             if df.empty:
-                print(f"⚠ No historical data for {self.config.symbol}, using default brick size")
+                logger.warning("⚠ No historical data for %s, using default brick size", self.config.symbol)
                 brick_size = 1.0
             else:
-                # Calculate ATR
-                atr_value = TechnicalIndicators.atr(df, self.config.atr_period).iloc[-1]
+                # Calculate ATR (only the latest value is needed)
+                atr_value = TechnicalIndicators.atr_last(df, self.config.atr_period)
                 
                 # Brick size = 1.5 * ATR, rounded, min 1, max 10
-                brick_size = min(10, max(1, round(self.config.atr_multiplier * atr_value, 0)))
+                if np.isfinite(atr_value):
+                    brick_size = float(np.clip(np.rint(self.config.atr_multiplier * atr_value), 1, 10))
+                else:
+                    brick_size = 1.0
             
             # Initialize renko with calculated brick size
             self.renko.initialize_brick(
@@ -104,13 +190,20 @@ class RenkoMACDStrategy(BaseStrategy):
                 brick_size=brick_size
             )
             
-            print(f"✓ Brick size for {self.config.symbol}: {brick_size}")
+            logger.info("✓ Brick size for %s: %s", self.config.symbol, brick_size)
             
         except Exception as e:
-            print(f"✗ Error initializing brick size: {str(e)}")
+            logger.error("✗ Error initializing brick size: %s", e)
             # Fallback to default
             self.renko.initialize_brick(self.config.symbol, brick_size=1.0)
     
+    def _fold_macd(self, closes: np.ndarray, state: tuple) -> tuple:
+        """Advance the MACD EMA state over closes"""
+        return _macd_loop(
+            closes if NUMBA_AVAILABLE else closes.tolist(),
+            *self._macd_alphas, *state
+        )
+    
     def update_macd_status(self, df: pd.DataFrame) -> None:
         """
         Update MACD crossover status
@@ -118,26 +211,54 @@ class RenkoMACDStrategy(BaseStrategy):
         Args:
             df: DataFrame with OHLC data
         """
-        if len(df) < self.config.macd_slow + self.config.macd_signal:
+        if len(df) < self._macd_min_len:
             return
         
-        # Calculate MACD
-        macd_line, signal_line, _ = TechnicalIndicators.macd(
-            df['close'],
-            fast_period=self.config.macd_fast,
-            slow_period=self.config.macd_slow,
-            signal_period=self.config.macd_signal
-        )
+        # Calculate MACD (latest values only; see _macd_loop)
+        close = df['close'].to_numpy(dtype=np.float64)
+        bars = df.index
         
-        # Check crossover
-        if not macd_line.empty and not signal_line.empty:
-            current_macd = macd_line.iloc[-1]
-            current_signal = signal_line.iloc[-1]
+        # Same bar at the same close: the crossover cannot have changed
+        tick_key = (bars[-1], close[-1])
+        if tick_key == self._macd_tick:
+            return
+        self._macd_tick = tick_key
+        
+        if self._macd_bar != bars[-2]:
+            # Locate the stored bar; only closes after it need folding in
+            pos = -1
+            if self._macd_bar is not None:
+                pos = bars.searchsorted(self._macd_bar)
+                if pos > len(bars) - 2 or bars[pos] != self._macd_bar:
+                    pos = -1
             
-            if current_macd > current_signal:
-                self.macd_crossover = "bullish"
-            elif current_macd < current_signal:
-                self.macd_crossover = "bearish"
+            if pos >= 0:
+                self._macd_state = self._fold_macd(close[pos + 1:-1], self._macd_state)
+            else:
+                # Seed from every closed bar
+                seed = float(close[0])
+                self._macd_state = self._fold_macd(close[1:-1], (seed, seed, 0.0))
+            self._macd_bar = bars[-2]
+        
+        # Forming bar: one step of the _macd_loop recursions, inline so the
+        # per-tick path skips the kernel call
+        a_fast, a_slow, a_signal = self._macd_alphas
+        fast, slow, signal = self._macd_state
+        x = float(close[-1])
+        fast = a_fast * x + (1 - a_fast) * fast
+        slow = a_slow * x + (1 - a_slow) * slow
+        
+        # Check crossover
+        current_macd = fast - slow
+        current_signal = a_signal * current_macd + (1 - a_signal) * signal
+        
+        if current_macd > current_signal:
+            self._macd_dir = 1
+        elif current_macd < current_signal:
+            self._macd_dir = -1
+        else:
+            return
+        self.macd_crossover = self._CROSSOVER[self._macd_dir]
     
     def process_tick(self, tick: Dict) -> Optional[Dict]:
         """
@@ -154,18 +275,22 @@ class RenkoMACDStrategy(BaseStrategy):
             return None
         
         # Update renko brick
-        brick_update = self.renko.update_brick(self.config.symbol, price)
+        brick_update = self.renko.update_brick(self._symbol, price)
         
-        if brick_update.get('brick_formed'):
-            print(f"{self.config.symbol}: Brick #{brick_update['brick_count']} formed at {price}")
-            print(f"  Upper: {brick_update['upper_limit']:.2f}, Lower: {brick_update['lower_limit']:.2f}")
+        if brick_update.get('brick_formed') and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%s: Brick #%d formed at %s (Upper: %.2f, Lower: %.2f)",
+                self._symbol, brick_update['brick_count'], price,
+                brick_update['upper_limit'], brick_update['lower_limit']
+            )
         
         return brick_update
     
     def generate_signal(
         self, 
         df: pd.DataFrame, 
-        current_price: float
+        current_price: float,
+        current_ts: Optional[datetime] = None
     ) -> Optional[TradingSignal]:
         """
         Generate trading signal based on Renko + MACD
@@ -173,6 +298,7 @@ class RenkoMACDStrategy(BaseStrategy):
         Args:
             df: Historical OHLC data (5-minute for MACD calculation)
             current_price: Current market price
+            current_ts: Time of this evaluation (default: datetime.now())
             
         Returns:
             TradingSignal or None
@@ -181,94 +307,91 @@ class RenkoMACDStrategy(BaseStrategy):
         self.update_macd_status(df)
         
         # Get renko state
-        brick_state = self.renko.get_brick_state(self.config.symbol)
+        brick_state = self.renko.get_brick_state(self._symbol)
         if not brick_state:
             return None
         
+        # Read the brick fields once
         brick_count = brick_state.brick_count
+        brick_size = brick_state.brick_size
         
-        # Calculate position size
-        quantity = int(self.config.capital / current_price)
+        # Calculate position size (reused while the price repeats)
+        if current_price != self._qty_price:
+            self._qty_price = current_price
+            self._qty = int(self._capital / current_price)
+        quantity = self._qty
         if quantity == 0:
             return None
         
         # Check if we have a position
         if self.position is not None:
-            return self._check_position_management(brick_state, current_price)
+            return self._check_position_management(brick_state, current_price, current_ts)
         
         # No position - check for entry signals
         
-        # BUY Signal: MACD bullish AND strong uptrend (≥2 green bricks)
-        if (self.macd_crossover == "bullish" and 
-            brick_count >= self.config.renko_brick_threshold):
-            
-            return TradingSignal(
-                timestamp=datetime.now(),
-                symbol=self.config.symbol,
-                signal_type=SignalType.BUY,
-                price=current_price,
-                quantity=quantity,
-                stop_loss=brick_state.lower_limit,
-                target=None,  # Trail with renko
-                reason=f"MACD bullish + {brick_count} green Renko bricks",
-                confidence=min(1.0, abs(brick_count) / 5),  # Higher confidence with more bricks
-                metadata={
-                    'macd_crossover': self.macd_crossover,
-                    'brick_count': brick_count,
-                    'brick_size': brick_state.brick_size
-                }
-            )
-        
-        # SELL Signal: MACD bearish AND strong downtrend (≤-2 red bricks)
-        elif (self.macd_crossover == "bearish" and 
-              brick_count <= -self.config.renko_brick_threshold):
-            
-            return TradingSignal(
-                timestamp=datetime.now(),
-                symbol=self.config.symbol,
-                signal_type=SignalType.SELL,
-                price=current_price,
-                quantity=quantity,
-                stop_loss=brick_state.upper_limit,
-                target=None,
-                reason=f"MACD bearish + {abs(brick_count)} red Renko bricks",
-                confidence=min(1.0, abs(brick_count) / 5),
-                metadata={
-                    'macd_crossover': self.macd_crossover,
-                    'brick_count': brick_count,
-                    'brick_size': brick_state.brick_size
-                }
-            )
+        # BUY: MACD bullish AND strong uptrend (≥2 green bricks)
+        # SELL: MACD bearish AND strong downtrend (≤-2 red bricks)
+        direction = self._macd_dir
+        if not direction or direction * brick_count < self._brick_threshold:
+            return None
         
-        return None
+        return TradingSignal(
+            timestamp=current_ts or datetime.now(),
+            symbol=self._symbol,
+            signal_type=self._SIGTYPE[direction],
+            price=current_price,
+            quantity=quantity,
+            stop_loss=getattr(brick_state, self._SL_ATTR[direction]),
+            target=None,  # Trail with renko
+            reason=(
+                f"MACD {self.macd_crossover} + {abs(brick_count)} "
+                f"{self._BRICK_COLOR[direction]} Renko bricks"
+            ),
+            confidence=min(1.0, abs(brick_count) / 5),  # Higher confidence with more bricks
+            metadata={
+                'macd_crossover': self.macd_crossover,
+                'brick_count': brick_count,
+                'brick_size': brick_size
+            }
+        )
     
-    def calculate_stop_loss(self, entry_price: float, signal_type: SignalType) -> float:
+    def calculate_stop_loss(
+        self,
+        entry_price: float,
+        signal_type: SignalType,
+        brick_state=None
+    ) -> float:
         """
         Calculate stop-loss based on Renko brick limits
         
         Args:
             entry_price: Entry price
             signal_type: BUY or SELL
+            brick_state: Renko brick state already fetched by the caller
+                (default: looked up from the renko service)
             
         Returns:
             Stop-loss price
         """
-        brick_state = self.renko.get_brick_state(self.config.symbol)
+        if brick_state is None:
+            brick_state = self.renko.get_brick_state(self.config.symbol)
         
         if not brick_state:
             # Fallback to 2% SL if no brick state available
-            if signal_type == SignalType.BUY:
-                return entry_price * 0.98
-            else:
-                return entry_price * 1.02
+            return entry_price * (1 + SL_SIGN[signal_type] * 0.02)
         
         # Use brick limits for stop-loss
-        if signal_type == SignalType.BUY:
+        if signal_type is SignalType.BUY:
             return brick_state.lower_limit
         else:  # SELL
             return brick_state.upper_limit
     
-    def calculate_target(self, entry_price: float, signal_type: SignalType) -> float:
+    def calculate_target(
+        self,
+        entry_price: float,
+        signal_type: SignalType,
+        stop_loss: Optional[float] = None
+    ) -> float:
         """
         Calculate target price
         
@@ -277,23 +400,24 @@ class RenkoMACDStrategy(BaseStrategy):
         Args:
             entry_price: Entry price
             signal_type: BUY or SELL
+            stop_loss: Stop-loss already computed for this entry
+                (default: recomputed from the brick state)
             
         Returns:
             Target price
         """
-        stop_loss = self.calculate_stop_loss(entry_price, signal_type)
+        if stop_loss is None:
+            stop_loss = self.calculate_stop_loss(entry_price, signal_type)
         risk = abs(entry_price - stop_loss)
         reward = risk * 2.0  # 2:1 risk:reward
         
-        if signal_type == SignalType.BUY:
-            return round(entry_price + reward, 1)
-        else:  # SELL
-            return round(entry_price - reward, 1)
+        return round(entry_price + TARGET_SIGN[signal_type] * reward, 1)
     
     def _check_position_management(
         self,
         brick_state,
-        current_price: float
+        current_price: float,
+        current_ts: Optional[datetime] = None
     ) -> Optional[TradingSignal]:
         """
         Check if position needs stop-loss update
@@ -301,6 +425,7 @@ class RenkoMACDStrategy(BaseStrategy):
         Args:
             brick_state: Current renko brick state
             current_price: Current price
+            current_ts: Time of this evaluation (default: datetime.now())
             
         Returns:
             Signal for SL update or None
@@ -309,15 +434,15 @@ class RenkoMACDStrategy(BaseStrategy):
             return None
         
         # Determine new stop-loss based on position type
-        if self.position.position_type == PositionType.LONG:
+        if self.position.is_long:
             new_sl = brick_state.lower_limit
         else:  # SHORT
             new_sl = brick_state.upper_limit
         
         # Return signal to update stop-loss
         return TradingSignal(
-            timestamp=datetime.now(),
-            symbol=self.config.symbol,
+            timestamp=current_ts or datetime.now(),
+            symbol=self._symbol,
             signal_type=SignalType.HOLD,
             price=current_price,
             quantity=self.position.quantity,
@@ -325,21 +450,17 @@ class RenkoMACDStrategy(BaseStrategy):
             target=None,
             reason="Update trailing stop-loss (Renko brick)",
             confidence=1.0,
-            metadata={'action': 'update_sl', 'brick_count': brick_state.brick_count}
+            metadata={**UPDATE_SL_METADATA, 'brick_count': brick_state.brick_count}
         )
     
     def should_enter(self, df: pd.DataFrame) -> bool:
         """Check if entry conditions are met"""
-        brick_state = self.renko.get_brick_state(self.config.symbol)
+        brick_state = self.renko.get_brick_state(self._symbol)
         if not brick_state:
             return False
         
-        brick_count = brick_state.brick_count
-        
-        return (
-            (self.macd_crossover == "bullish" and brick_count >= self.config.renko_brick_threshold) or
-            (self.macd_crossover == "bearish" and brick_count <= -self.config.renko_brick_threshold)
-        )
+        direction = self._macd_dir
+        return bool(direction) and direction * brick_state.brick_count >= self._brick_threshold
     
     def should_exit(self, df: pd.DataFrame, position: Position) -> bool:
         """Check if exit conditions are met"""
@@ -354,26 +475,32 @@ class RenkoMACDStrategy(BaseStrategy):
     def get_status(self) -> Dict:
         """Get current strategy status"""
         brick_state = self.renko.get_brick_state(self.config.symbol)
+        if brick_state:
+            renko = {
+                'brick_count': brick_state.brick_count,
+                'brick_size': brick_state.brick_size,
+                'upper_limit': brick_state.upper_limit,
+                'lower_limit': brick_state.lower_limit
+            }
+        else:
+            renko = dict(self._EMPTY_RENKO)
+        
+        position = self.position
         
         return {
             'strategy': self.config.name,
             'symbol': self.config.symbol,
             'active': self.is_active,
-            'has_position': self.position is not None,
+            'has_position': position is not None,
             'position': {
-                'type': self.position.position_type.value if self.position else None,
-                'quantity': self.position.quantity if self.position else 0,
-                'entry_price': self.position.entry_price if self.position else 0,
-                'stop_loss': self.position.stop_loss if self.position else 0,
-                'pnl': self.position.pnl if self.position else 0
-            } if self.position else None,
+                'type': position.position_type.value,
+                'quantity': position.quantity,
+                'entry_price': position.entry_price,
+                'stop_loss': position.stop_loss,
+                'pnl': position.pnl
+            } if position else None,
             'macd_crossover': self.macd_crossover,
-            'renko': {
-                'brick_count': brick_state.brick_count if brick_state else 0,
-                'brick_size': brick_state.brick_size if brick_state else 0,
-                'upper_limit': brick_state.upper_limit if brick_state else None,
-                'lower_limit': brick_state.lower_limit if brick_state else None
-            },
+            'renko': renko,
             'trades_today': self.trades_today,
             'pnl_today': self.pnl_today
         }
@@ -3,7 +3,10 @@ Scalping Strategy (High Frequency for Testing)
 Generates frequent signals based on RSI extremes.
 Designed to create multiple trades in 1-2 minutes for testing dashboards.
 """
+import math
+from collections import deque
 from typing import Optional, Dict
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from app.strategies.base_strategy import BaseStrategy, StrategyConfig, TradingSignal, SignalType, PositionType
@@ -28,10 +31,76 @@ class ScalpingStrategy(BaseStrategy):
         # State
         self.last_signal_time = None
         
-    def generate_signal(self, df: pd.DataFrame, current_price: float) -> Optional[TradingSignal]:
+        # Rolling RSI window: gains/losses of the last rsi_period closes,
+        # advanced one bar at a time
+        self._gains = deque(maxlen=self.rsi_period)
+        self._losses = deque(maxlen=self.rsi_period)
+        self._rsi_bar = None
+    
+    def _push_delta(self, delta: float, replace: bool = False):
+        """Append a close-to-close change to the window (or overwrite the last one)"""
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if replace:
+            self._gains[-1] = gain
+            self._losses[-1] = loss
+        else:
+            self._gains.append(gain)
+            self._losses.append(loss)
+    
+    def _rsi(self, df: pd.DataFrame) -> float:
+        """
+        RSI over simple rolling means of gains and losses
+        
+        Same definition as diff() + rolling(rsi_period).mean(), but only
+        the last rsi_period changes are kept. A forming bar overwrites the
+        newest change, one new bar slides the window, and anything else
+        reseeds it from the tail of the data.
+        
+        Returns:
+            Latest RSI (NaN until enough bars or when price is flat)
+        """
+        n = self.rsi_period
+        close = df['close'].to_numpy(dtype=np.float64, copy=False)
+        if len(close) < n:
+            return math.nan
+        
+        bars = df.index
+        last_bar = bars[-1]
+        
+        if self._gains and last_bar == self._rsi_bar:
+            # Current bar still forming: swap in its latest change
+            self._push_delta(float(close[-1] - close[-2]), replace=True)
+        elif self._gains and bars[-2] == self._rsi_bar:
+            # One new bar: finalise the previous change, then slide
+            self._push_delta(float(close[-2] - close[-3]), replace=True)
+            self._push_delta(float(close[-1] - close[-2]))
+        else:
+            # Warm-up: split the last n changes in one vectorised pass
+            deltas = np.diff(close[-(n + 1):])
+            # diff() leaves the first bar's change NaN, which counts as 0
+            if len(close) == n:
+                deltas = np.concatenate(([0.0], deltas))
+            self._gains.clear()
+            self._losses.clear()
+            self._gains.extend(np.where(deltas > 0, deltas, 0.0).tolist())
+            self._losses.extend(np.where(deltas < 0, -deltas, 0.0).tolist())
+        
+        self._rsi_bar = last_bar
+        
+        # The 1/n of both means cancels in gain / loss, so sums suffice
+        gain = math.fsum(self._gains)
+        loss = math.fsum(self._losses)
+        if loss:
+            return 100 - (100 / (1 + gain / loss))
+        return 100.0 if gain else math.nan
+        
+    def generate_signal(self, df: pd.DataFrame, current_price: float, current_ts: Optional[datetime] = None) -> Optional[TradingSignal]:
         """
         Generate rapid signals
         """
+        timestamp = current_ts or datetime.now()
+        
         # 1. Update Position PnL if active
         self.update_position(current_price)
         
@@ -40,7 +109,7 @@ class ScalpingStrategy(BaseStrategy):
             return None
         
         # 3. Check Exit Conditions (Stop Loss / Target)
-        exit_signal = self.check_exit_conditions(current_price)
+        exit_signal = self.check_exit_conditions(current_price, timestamp)
         if exit_signal:
             return exit_signal
         
@@ -48,20 +117,11 @@ class ScalpingStrategy(BaseStrategy):
         if self.position is not None:
             return None
             
-        # 5. Calculate RSI (Manually or using library)
-        # Simple RSI calculation for last few candles
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        if rsi.empty:
+        # 5. Calculate RSI (incrementally, see _rsi)
+        if df.empty:
             return None
             
-        current_rsi = rsi.iloc[-1]
-        
-        timestamp = datetime.now()
+        current_rsi = self._rsi(df)
         
         # LOGIC: Extremely sensitive triggers
         # Just alternate basically.
@@ -101,7 +161,7 @@ class ScalpingStrategy(BaseStrategy):
     def calculate_stop_loss(self, entry_price: float, signal_type: SignalType) -> float:
         """Tight 0.2% SL"""
         sl_pct = 0.002
-        if signal_type == SignalType.BUY:
+        if signal_type is SignalType.BUY:
             return entry_price * (1 - sl_pct)
         else:
             return entry_price * (1 + sl_pct)
@@ -109,7 +169,7 @@ class ScalpingStrategy(BaseStrategy):
     def calculate_target(self, entry_price: float, signal_type: SignalType) -> float:
         """Quick 0.4% Target"""
         target_pct = 0.004
-        if signal_type == SignalType.BUY:
+        if signal_type is SignalType.BUY:
             return entry_price * (1 + target_pct)
         else:
             return entry_price * (1 - target_pct)
@@ -8,21 +8,88 @@ Strategy Logic:
 - SELL when all 3 supertrends are red (above price)
 - Dynamic stop-loss based on weighted supertrend values
 """
-from typing import Optional, Dict, List
+import math
+from typing import Optional, Dict, List, Tuple
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
 from app.strategies.base_strategy import (
     BaseStrategy, TradingSignal, Position, StrategyConfig,
-    SignalType, PositionType
+    SignalType, PositionType, UPDATE_SL_METADATA
 )
 from app.services.indicators import TechnicalIndicators
 
 
+def _supertrend_fold(highs, lows, closes, trs, period: int, multiplier: float, state: Optional[tuple]) -> tuple:
+    """
+    Advance one supertrend over new bars
+    
+    Same arithmetic as TechnicalIndicators.supertrend - ATR as
+    ewm(alpha=1/period, adjust=False) of the true range, bands around the
+    high/low midpoint, then the band-following recursion - one bar at a time.
+    
+    Args:
+        highs, lows, closes: New bars (finite floats)
+        trs: True range of those bars, shared by every supertrend
+        period: ATR period; the first supertrend value is at this bar
+        multiplier: ATR multiplier
+        state: Result of the previous fold (None to start from the first bar)
+        
+    Returns:
+        (bars seen, atr, supertrend, uptrend); supertrend is NaN until
+        period bars have been seen
+    """
+    if state is None:
+        count, atr, st, uptrend = 0, math.nan, math.nan, True
+    else:
+        count, atr, st, uptrend = state
+    
+    alpha = 1 / period
+    decay = 1. - alpha
+    
+    for high, low, close, tr in zip(highs, lows, closes, trs):
+        if count:
+            # pandas' ewm(adjust=False) step, including its normalisation
+            if atr != tr:
+                atr = (decay * atr + alpha * tr) / (decay + alpha)
+        else:
+            atr = tr
+        
+        mid = (high + low) / 2
+        if count == period:
+            st = mid - (multiplier * atr)
+            uptrend = True
+        elif count > period:
+            if uptrend:
+                if close <= st:
+                    st = mid + (multiplier * atr)
+                    uptrend = False
+                else:
+                    band = mid - (multiplier * atr)
+                    st = st if st > band else band
+            else:
+                if close >= st:
+                    st = mid - (multiplier * atr)
+                    uptrend = True
+                else:
+                    band = mid + (multiplier * atr)
+                    st = st if st < band else band
+        
+        count += 1
+    
+    return count, atr, st, uptrend
+
+
 class SupertrendStrategyConfig(StrategyConfig):
     """Configuration for Supertrend Strategy"""
     
+    # StrategyConfig is slotted; keep the subclass free of a per-instance __dict__
+    __slots__ = (
+        'st1_period', 'st1_multiplier', 'st2_period',
+        'st2_multiplier', 'st3_period', 'st3_multiplier'
+    )
+    
     def __init__(
         self,
         symbol: str,
@@ -59,16 +126,33 @@ class SupertrendStrategy(BaseStrategy):
     Places orders with stop-loss when all 3 supertrends align.
     """
     
+    # Direction codes: +1 green (price above ST), -1 red, 0 not yet known
+    _ST_KEYS = ('st1', 'st2', 'st3')
+    _DIRECTION_NAMES = {1: "green", -1: "red", 0: None}
+    _ALL_GREEN = [1, 1, 1]
+    _ALL_RED = [-1, -1, -1]
+    
     def __init__(self, config: SupertrendStrategyConfig):
         super().__init__(config)
         self.config: SupertrendStrategyConfig = config
         
-        # Track supertrend directions
-        self.st_directions = {
-            'st1': None,  # "green" or "red"
-            'st2': None,
-            'st3': None
-        }
+        # Track supertrend directions (codes per st1..st3, see _DIRECTION_NAMES)
+        self._st_dirs = [0, 0, 0]
+        
+        # Incremental supertrends: one _supertrend_fold state per (period,
+        # multiplier) as of the last closed bar; the forming bar is folded
+        # in per call
+        self._st_params = (
+            (config.st1_period, config.st1_multiplier),
+            (config.st2_period, config.st2_multiplier),
+            (config.st3_period, config.st3_multiplier)
+        )
+        self._st_state = None
+        self._st_bar = None
+        
+        # (bar, high, low, close) of the last evaluation and its result
+        self._st_tick = None
+        self._st_last = None
         
         # Track previous values for reversal detection
         self.prev_close = None
@@ -76,7 +160,13 @@ class SupertrendStrategy(BaseStrategy):
         self.prev_st2 = None
         self.prev_st3 = None
     
-    def calculate_supertrends(self, df: pd.DataFrame) -> pd.DataFrame:
+    @property
+    def st_directions(self) -> Dict[str, Optional[str]]:
+        """Supertrend directions as "green"/"red"/None, built on read"""
+        names = self._DIRECTION_NAMES
+        return {key: names[code] for key, code in zip(self._ST_KEYS, self._st_dirs)}
+    
+    def calculate_supertrends(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Calculate 3 Supertrend indicators with different parameters
         
@@ -84,77 +174,121 @@ class SupertrendStrategy(BaseStrategy):
             df: DataFrame with OHLC data
             
         Returns:
-            DataFrame with supertrend columns added
+            (st1, st2, st3) value arrays aligned with df
         """
-        df = df.copy()
-        
-        # Calculate 3 supertrends
-        df['st1'] = TechnicalIndicators.supertrend(
-            df, 
-            period=self.config.st1_period,
-            multiplier=self.config.st1_multiplier
+        return tuple(
+            TechnicalIndicators.supertrend(df, period=period, multiplier=multiplier).to_numpy()
+            for period, multiplier in (
+                (self.config.st1_period, self.config.st1_multiplier),
+                (self.config.st2_period, self.config.st2_multiplier),
+                (self.config.st3_period, self.config.st3_multiplier)
+            )
         )
+    
+    def _update_supertrends(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Latest two values of each supertrend, advanced bar by bar
         
-        df['st2'] = TechnicalIndicators.supertrend(
-            df,
-            period=self.config.st2_period,
-            multiplier=self.config.st2_multiplier
-        )
+        Only bars closed since the last call are folded into the stored
+        state. An unknown history, or non-finite prices, falls back to
+        calculate_supertrends.
         
-        df['st3'] = TechnicalIndicators.supertrend(
-            df,
-            period=self.config.st3_period,
-            multiplier=self.config.st3_multiplier
+        Args:
+            df: DataFrame with OHLC data
+            
+        Returns:
+            (st1, st2, st3) arrays holding the previous and current bar
+        """
+        bars = df.index
+        if len(bars) < 2:
+            return self.calculate_supertrends(df)
+        
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        
+        # Same forming bar as last time: nothing to recompute
+        tick_key = (bars[-1], high[-1], low[-1], close[-1])
+        if tick_key == self._st_tick:
+            return self._st_last
+        
+        # Locate the stored bar; only closes after it need folding in
+        pos = -1
+        if self._st_bar is not None:
+            pos = bars.searchsorted(self._st_bar)
+            if pos > len(bars) - 2 or bars[pos] != self._st_bar:
+                pos = -1
+        start = pos + 1
+        
+        if not (
+            np.isfinite(high[start:]).all()
+            and np.isfinite(low[start:]).all()
+            and np.isfinite(close[start:]).all()
+        ):
+            self._st_state = self._st_bar = self._st_tick = None
+            return tuple(st[-2:] for st in self.calculate_supertrends(df))
+        
+        if start < len(bars) - 1:
+            new = slice(start, -1)
+            highs, lows, closes = high[new].tolist(), low[new].tolist(), close[new].tolist()
+            
+            # True range once per bar, shared by the three supertrends
+            if pos >= 0:
+                states = self._st_state
+                trs = [
+                    max(h - l, abs(h - pc), abs(l - pc))
+                    for h, l, pc in zip(highs, lows, close[start - 1:-2].tolist())
+                ]
+            else:
+                states = (None, None, None)
+                trs = TechnicalIndicators.true_range(df)[:-1].tolist()
+            
+            self._st_state = tuple(
+                _supertrend_fold(highs, lows, closes, trs, period, multiplier, state)
+                for (period, multiplier), state in zip(self._st_params, states)
+            )
+            self._st_bar = bars[-2]
+        
+        # Forming bar, without committing it to the state
+        h, l, c, pc = float(high[-1]), float(low[-1]), float(close[-1]), float(close[-2])
+        last = ([h], [l], [c], [max(h - l, abs(h - pc), abs(l - pc))])
+        self._st_last = tuple(
+            np.array([state[2], _supertrend_fold(*last, period, multiplier, state)[2]])
+            for (period, multiplier), state in zip(self._st_params, self._st_state)
         )
-        
-        return df
+        self._st_tick = tick_key
+        return self._st_last
     
-    def update_st_directions(self, df: pd.DataFrame) -> None:
+    def update_st_directions(self, close: np.ndarray, supertrends: Tuple[np.ndarray, ...]) -> None:
         """
         Update supertrend direction tracking based on price crossovers
         
         Args:
-            df: DataFrame with OHLC and supertrend data
+            close: Close prices
+            supertrends: (st1, st2, st3) arrays aligned with close
         """
-        if len(df) < 2:
+        if len(close) < 2:
             return
         
-        current_close = df['close'].iloc[-1]
-        prev_close = df['close'].iloc[-2]
+        current_close = close[-1]
+        prev_close = close[-2]
         
-        current_st1 = df['st1'].iloc[-1]
-        prev_st1 = df['st1'].iloc[-2]
+        dirs = self._st_dirs
         
-        current_st2 = df['st2'].iloc[-1]
-        prev_st2 = df['st2'].iloc[-2]
-        
-        current_st3 = df['st3'].iloc[-1]
-        prev_st3 = df['st3'].iloc[-2]
-        
-        # Check for ST1 reversal
-        if not pd.isna(current_st1) and not pd.isna(prev_st1):
+        # Comparisons against NaN are False, so a missing value leaves the
+        # direction unchanged without a separate check
+        for i, st in enumerate(supertrends):
+            current_st = st[-1]
+            prev_st = st[-2]
+            
             # Bearish reversal: price crosses below supertrend
-            if current_st1 > current_close and prev_st1 < prev_close:
-                self.st_directions['st1'] = "red"
+            if current_st > current_close and prev_st < prev_close:
+                dirs[i] = -1
             # Bullish reversal: price crosses above supertrend
-            elif current_st1 < current_close and prev_st1 > prev_close:
-                self.st_directions['st1'] = "green"
-        
-        # Check for ST2 reversal
-        if not pd.isna(current_st2) and not pd.isna(prev_st2):
-            if current_st2 > current_close and prev_st2 < prev_close:
-                self.st_directions['st2'] = "red"
-            elif current_st2 < current_close and prev_st2 > prev_close:
-                self.st_directions['st2'] = "green"
-        
-        # Check for ST3 reversal
-        if not pd.isna(current_st3) and not pd.isna(prev_st3):
-            if current_st3 > current_close and prev_st3 < prev_close:
-                self.st_directions['st3'] = "red"
-            elif current_st3 < current_close and prev_st3 > prev_close:
-                self.st_directions['st3'] = "green"
+            elif current_st < current_close and prev_st > prev_close:
+                dirs[i] = 1
     
-    def calculate_stop_loss(self, df: pd.DataFrame) -> float:
+    def calculate_stop_loss(self, close: np.ndarray, supertrends: Tuple[np.ndarray, ...]) -> float:
         """
         Calculate dynamic stop-loss based on supertrend values
         
@@ -163,38 +297,40 @@ class SupertrendStrategy(BaseStrategy):
         - 40% weight to second closest ST
         
         Args:
-            df: DataFrame with supertrend data
+            close: Close prices
+            supertrends: (st1, st2, st3) arrays aligned with close
             
         Returns:
             Stop-loss price
         """
-        if len(df) == 0:
+        if len(close) == 0:
             return 0.0
         
-        current_close = df['close'].iloc[-1]
-        st_values = df[['st1', 'st2', 'st3']].iloc[-1]
+        current_close = float(close[-1])
         
-        # Remove NaN values
-        st_values = st_values.dropna()
+        # Latest value of each supertrend, NaNs removed (NaN != NaN);
+        # plain floats, as numpy overhead dominates for three values
+        st_values = [v for v in (float(st[-1]) for st in supertrends) if v == v]
         
-        if len(st_values) == 0:
+        if not st_values:
             return current_close * 0.98  # Default 2% SL
         
         # All STs above price (short scenario)
-        if st_values.min() > current_close:
-            sorted_st = st_values.sort_values(ascending=True)
-            sl = (0.6 * sorted_st.iloc[0]) + (0.4 * sorted_st.iloc[1] if len(sorted_st) > 1 else 0.4 * sorted_st.iloc[0])
+        if min(st_values) > current_close:
+            sorted_st = sorted(st_values)
+            sl = (0.6 * sorted_st[0]) + (0.4 * sorted_st[1] if len(sorted_st) > 1 else 0.4 * sorted_st[0])
         
         # All STs below price (long scenario)
-        elif st_values.max() < current_close:
-            sorted_st = st_values.sort_values(ascending=False)
-            sl = (0.6 * sorted_st.iloc[0]) + (0.4 * sorted_st.iloc[1] if len(sorted_st) > 1 else 0.4 * sorted_st.iloc[0])
+        elif max(st_values) < current_close:
+            sorted_st = sorted(st_values, reverse=True)
+            sl = (0.6 * sorted_st[0]) + (0.4 * sorted_st[1] if len(sorted_st) > 1 else 0.4 * sorted_st[0])
         
         # Mixed scenario - use mean
         else:
-            sl = st_values.mean()
+            sl = sum(st_values) / len(st_values)
         
-        return round(sl, 1)
+        # Rounded as np.round(sl, 1) always did it: rint(sl * 10) / 10
+        return round(sl * 10) / 10
     
     def calculate_target(self, entry_price: float, signal_type: SignalType) -> float:
         """
@@ -210,10 +346,10 @@ class SupertrendStrategy(BaseStrategy):
         Returns:
             Target price (nominal, not strictly enforced)
         """
-        if signal_type == SignalType.BUY:
+        if signal_type is SignalType.BUY:
             # 3% profit target for longs
             return round(entry_price * 1.03, 1)
-        elif signal_type == SignalType.SELL:
+        elif signal_type is SignalType.SELL:
             # 3% profit target for shorts
             return round(entry_price * 0.97, 1)
         else:
@@ -221,16 +357,17 @@ class SupertrendStrategy(BaseStrategy):
     
     def all_green(self) -> bool:
         """Check if all 3 supertrends are green"""
-        return all(direction == "green" for direction in self.st_directions.values())
+        return self._st_dirs == self._ALL_GREEN
     
     def all_red(self) -> bool:
         """Check if all 3 supertrends are red"""
-        return all(direction == "red" for direction in self.st_directions.values())
+        return self._st_dirs == self._ALL_RED
     
     def generate_signal(
         self, 
         df: pd.DataFrame, 
-        current_price: float
+        current_price: float,
+        current_ts: Optional[datetime] = None
     ) -> Optional[TradingSignal]:
         """
         Generate trading signal based on supertrend alignment
@@ -238,15 +375,17 @@ class SupertrendStrategy(BaseStrategy):
         Args:
             df: Historical OHLC data
             current_price: Current market price
+            current_ts: Time of this evaluation (default: datetime.now())
             
         Returns:
             TradingSignal or None
         """
-        # Calculate supertrends
-        df = self.calculate_supertrends(df)
+        # Advance the supertrends (incrementally, see _update_supertrends)
+        supertrends = self._update_supertrends(df)
+        close = df['close'].to_numpy()
         
         # Update directions
-        self.update_st_directions(df)
+        self.update_st_directions(close, supertrends)
         
         # Calculate quantity based on capital
         quantity = int(self.config.capital / current_price)
@@ -254,18 +393,18 @@ class SupertrendStrategy(BaseStrategy):
             return None
         
         # Calculate stop-loss
-        stop_loss = self.calculate_stop_loss(df)
+        stop_loss = self.calculate_stop_loss(close, supertrends)
         
         # Check if we have a position
         if self.position is not None:
             # Position exists - check for stop-loss update or exit
-            return self._check_position_management(df, current_price, stop_loss)
+            return self._check_position_management(df, current_price, stop_loss, current_ts)
         
         # No position - check for entry signals
         if self.all_green():
             # All supertrends are bullish - BUY signal
             return TradingSignal(
-                timestamp=datetime.now(),
+                timestamp=current_ts or datetime.now(),
                 symbol=self.config.symbol,
                 signal_type=SignalType.BUY,
                 price=current_price,
@@ -274,17 +413,13 @@ class SupertrendStrategy(BaseStrategy):
                 target=None,  # No fixed target, trail with supertrend
                 reason="All 3 Supertrends GREEN - Bullish alignment",
                 confidence=1.0,
-                metadata={
-                    'st1': self.st_directions['st1'],
-                    'st2': self.st_directions['st2'],
-                    'st3': self.st_directions['st3']
-                }
+                metadata=self.st_directions
             )
         
         elif self.all_red():
             # All supertrends are bearish - SELL signal
             return TradingSignal(
-                timestamp=datetime.now(),
+                timestamp=current_ts or datetime.now(),
                 symbol=self.config.symbol,
                 signal_type=SignalType.SELL,
                 price=current_price,
@@ -293,11 +428,7 @@ class SupertrendStrategy(BaseStrategy):
                 target=None,
                 reason="All 3 Supertrends RED - Bearish alignment",
                 confidence=1.0,
-                metadata={
-                    'st1': self.st_directions['st1'],
-                    'st2': self.st_directions['st2'],
-                    'st3': self.st_directions['st3']
-                }
+                metadata=self.st_directions
             )
         
         return None
@@ -306,7 +437,8 @@ class SupertrendStrategy(BaseStrategy):
         self,
         df: pd.DataFrame,
         current_price: float,
-        new_stop_loss: float
+        new_stop_loss: float,
+        current_ts: Optional[datetime] = None
     ) -> Optional[TradingSignal]:
         """
         Check if position needs stop-loss update or exit
@@ -315,6 +447,7 @@ class SupertrendStrategy(BaseStrategy):
             df: DataFrame with OHLC data
             current_price: Current price
             new_stop_loss: New calculated stop-loss
+            current_ts: Time of this evaluation (default: datetime.now())
             
         Returns:
             Signal for SL update or None
@@ -325,7 +458,7 @@ class SupertrendStrategy(BaseStrategy):
         # Return signal to update stop-loss
         # The strategy engine should handle modifying the SL order
         return TradingSignal(
-            timestamp=datetime.now(),
+            timestamp=current_ts or datetime.now(),
             symbol=self.config.symbol,
             signal_type=SignalType.HOLD,  # HOLD but update SL
             price=current_price,
@@ -334,7 +467,7 @@ class SupertrendStrategy(BaseStrategy):
             target=None,
             reason="Update trailing stop-loss",
             confidence=1.0,
-            metadata={'action': 'update_sl'}
+            metadata=UPDATE_SL_METADATA
         )
     
     def should_enter(self, df: pd.DataFrame) -> bool:
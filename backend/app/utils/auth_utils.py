@@ -29,7 +29,7 @@ async def get_session_token(
     
     # Check Authorization header
     if authorization and authorization.startswith("Bearer "):
-        return authorization.replace("Bearer ", "")
+        return authorization[7:]
     
     return None
 
@@ -52,12 +52,16 @@ async def require_session_token(
     Raises:
         HTTPException: If token not found
     """
-    session_token = await get_session_token(authorization, token)
+    # Same lookup as get_session_token, inlined to skip a nested await
+    if token:
+        return token
     
-    if not session_token:
-        raise HTTPException(
-            status_code=401,
-            detail="Authentication required. Please provide session token in X-Session-Token header or Authorization header."
-        )
+    if authorization and authorization.startswith("Bearer "):
+        session_token = authorization[7:]
+        if session_token:
+            return session_token
     
-    return session_token
+    raise HTTPException(
+        status_code=401,
+        detail="Authentication required. Please provide session token in X-Session-Token header or Authorization header."
+    )
@@ -0,0 +1,62 @@
+"""
+Logging Utilities
+Shared logger setup for services and strategies
+"""
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.config import VERBOSE_LOGGING
+
+
+# All loggers share one queue; a single listener thread does the console
+# writes so callers (tick reader, bot loop) never block on stdout
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def _start_listener():
+    """Start the shared console listener once"""
+    global _listener
+    
+    with _listener_lock:
+        if _listener is None:
+            console = logging.StreamHandler()
+            console.setFormatter(logging.Formatter("%(message)s"))
+            _listener = QueueListener(_log_queue, console)
+            _listener.start()
+            
+            # Flush whatever is still queued on shutdown
+            atexit.register(_listener.stop)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a console logger for a backend component
+    
+    The app has no central logging config, so each logger gets a plain
+    message-only console handler (matching the existing print output).
+    Records are handed to a background listener thread through a queue,
+    so logging never waits on console I/O.
+    Level is DEBUG when VERBOSE_LOGGING is enabled, INFO otherwise, so
+    debug-level formatting is skipped entirely in quiet deployments.
+    
+    Args:
+        name: Logger name (e.g. "trading_bot")
+        
+    Returns:
+        Configured logger
+    """
+    logger = logging.getLogger(name)
+    
+    if not logger.handlers:
+        _start_listener()
+        logger.addHandler(QueueHandler(_log_queue))
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG if VERBOSE_LOGGING else logging.INFO)
+    
+    return logger
@@ -1,7 +1,7 @@
 
 import os
 import asyncio
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 
 async def cleanup():
     uri = os.getenv("MONGO_URI")
@@ -10,26 +10,32 @@ async def cleanup():
         return
 
     print(f"Connecting to: {uri.split('@')[1]}")
-    client = MongoClient(uri)
+    client = AsyncIOMotorClient(uri)
     db = client["smart_algo_trade"]
     collection = db["trade_history"]
     
-    # Define query for mock data
-    query = {"order_id": {"$regex": "^(MOCK|DEMO)_"}}
+    # Define query for mock data: one plain prefix per branch, so each
+    # can use an order_id index where one exists
+    query = {"$or": [
+        {"order_id": {"$regex": "^MOCK_"}},
+        {"order_id": {"$regex": "^DEMO_"}}
+    ]}
     
     # Count before deletion
-    count = collection.count_documents(query)
+    count = await collection.count_documents(query)
     print(f"🔍 Found {count} simulated trades to clean up.")
     
     if count > 0:
-        result = collection.delete_many(query)
+        result = await collection.delete_many(query)
         print(f"✅ Deleted {result.deleted_count} simulated trades.")
     else:
         print("✓ No simulated data found.")
         
     # Verify remaining
-    remaining = collection.count_documents({})
+    remaining = await collection.count_documents({})
     print(f"📉 Remaining Trades in DB: {remaining}")
+    
+    client.close()
 
 if __name__ == "__main__":
     asyncio.run(cleanup())
@@ -1,7 +1,7 @@
 
 import os
 import asyncio
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 import sys
 
 # Load env vars potentially? No, we will export again.
@@ -13,31 +13,50 @@ async def check_data():
         return
 
     print(f"Connecting to: {uri.split('@')[1]}") # Print host part for verification
-    client = MongoClient(uri)
+    client = AsyncIOMotorClient(uri)
     db = client["smart_algo_trade"]
     
-    # Check trade_history
+    # Check trade_history: every count, the sample and the orders total in
+    # a single aggregation, so Atlas is only asked once
     collection = db["trade_history"]
-    count = collection.count_documents({})
+    real = {"$match": {"order_id": {"$regex": "^ORD_"}}}
+    mock = {"$match": {"$or": [
+        {"order_id": {"$regex": "^MOCK_"}},
+        {"order_id": {"$regex": "^DEMO_"}}
+    ]}}
+    results = await collection.aggregate([
+        {"$facet": {
+            "total": [{"$count": "n"}],
+            "real": [real, {"$count": "n"}],
+            "mock": [mock, {"$count": "n"}],
+            "sample": [real, {"$limit": 1}]
+        }},
+        {"$unionWith": {"coll": "orders", "pipeline": [{"$count": "orders"}]}}
+    ]).to_list(2)
+    
+    facets = results[0]
+    count = facets["total"][0]["n"] if facets["total"] else 0
+    order_count = results[1]["orders"] if len(results) > 1 else 0
     print(f"📉 Total Trades in DB: {count}")
 
     if count > 0:
-        real_trades = collection.count_documents({"order_id": {"$regex": "^ORD_"}})
-        mock_trades = collection.count_documents({"order_id": {"$regex": "^(MOCK|DEMO)_"}})
+        real_trades = facets["real"][0]["n"] if facets["real"] else 0
+        mock_trades = facets["mock"][0]["n"] if facets["mock"] else 0
+        sample = facets["sample"][0] if facets["sample"] else None
         
         print(f"📊 Data Analysis:")
         print(f"   • Real Bot Trades: {real_trades}")
         print(f"   • Simulated/Mock:  {mock_trades}")
         
-        sample = collection.find_one({"order_id": {"$regex": "^ORD_"}})
         if sample:
             print(f"   • Sample Real Trade: {sample.get('symbol')} | {sample.get('pnl')}")
         else:
             print(f"   • No real trades found yet.")
             
     # Check Orders Collection
-    order_count = db["orders"].count_documents({})
     print(f"📦 Total Orders in DB: {order_count}")
+    
+    client.close()
 
 if __name__ == "__main__":
     asyncio.run(check_data())
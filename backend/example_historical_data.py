@@ -28,16 +28,25 @@ fut_df = market_data_service.get_nfo_futures()
 print(f"Total futures: {len(fut_df)}")
 
 
+# Token per trading symbol, built once so lookups skip a full column scan
+def build_token_index(instrument_df):
+    """Map tradingsymbol -> instrument_token (first row wins, as in a scan)"""
+    unique = instrument_df.drop_duplicates('tradingsymbol')
+    return dict(zip(unique.tradingsymbol.values, unique.instrument_token.values))
+
+
+TOKEN_INDEX = build_token_index(instrument_df)
+_indexed_df = instrument_df
+
+
 # instrumentLookup function (matches reference code signature)
 def instrumentLookup(instrument_df, symbol):
     """
     Looks up instrument token for a given script from instrument dump
     Matches the reference code's instrumentLookup function
     """
-    try:
-        return instrument_df[instrument_df.tradingsymbol == symbol].instrument_token.values[0]
-    except:
-        return -1
+    index = TOKEN_INDEX if instrument_df is _indexed_df else build_token_index(instrument_df)
+    return index.get(symbol, -1)
 
 
 # fetchOHLC function (matches reference code signature)
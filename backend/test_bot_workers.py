@@ -0,0 +1,329 @@
+"""
+Test Trading Bot Worker Pipeline
+Exercises the bot's per-symbol strategy fan-out and order worker without
+a broker session
+
+Strategies and order placement are stand-ins and market data is pre-seeded
+into the bot's caches, so no Kite or network access is needed.
+"""
+import os
+import sys
+import queue
+import threading
+import time
+import concurrent.futures
+from datetime import datetime
+from unittest import mock
+sys.path.append('.')
+
+# Fail fast when no MongoDB is reachable (paper trading connects at import)
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017/?serverSelectionTimeoutMS=500")
+
+import pandas as pd
+
+from app.services.trading_bot import TradingBot, BotStatus, _candle_bucket
+from app.services.order_service import order_service
+from app.services.market_hours import market_hours
+from app.strategies.base_strategy import TradingSignal, SignalType, UPDATE_SL_METADATA
+
+
+class BlockingStrategy:
+    """Strategy stand-in whose generate_signal waits until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def generate_signal(self, df, current_price, current_ts=None):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            self.release.wait(10)
+        finally:
+            with self._lock:
+                self.active -= 1
+        return None
+
+
+def make_bot(strategies: dict) -> TradingBot:
+    """Bot wired to a worker pool, with LTPs and history pre-seeded"""
+    bot = TradingBot()
+    bot.timeframe = "day"
+    bot.check_interval = 6  # wait() timeout of 1 second
+    bot._executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+    bot.strategies = dict(strategies)
+
+    bucket = _candle_bucket(time.time(), bot.timeframe)
+    bot._hist_cache_bucket = bucket
+    df = pd.DataFrame({'close': [100.0, 101.0]})
+    for symbol in strategies:
+        bot._latest_ltp[bot._nse_key(symbol)] = {'last_price': 101.0}
+        bot._hist_cache[(symbol, bot.timeframe, bucket)] = df
+    bot._latest_ltp_ts = time.time()
+    return bot
+
+
+def test_timed_out_strategy_is_not_resubmitted():
+    """A strategy still running from an earlier cycle is skipped, not re-run"""
+    print("\n" + "=" * 60)
+    print("TEST: Timed-out strategy is not evaluated twice at once")
+    print("=" * 60)
+
+    strategy = BlockingStrategy()
+    bot = make_bot({"AAA": strategy})
+    try:
+        # Cycle 1 times out with generate_signal still blocked
+        bot._process_strategies()
+        assert strategy.calls == 1
+        assert "AAA" in bot._running
+
+        # Cycle 2 must not start a second evaluation of the same strategy
+        bot._latest_ltp_ts = time.time()
+        bot._process_strategies()
+        assert strategy.calls == 1
+        assert strategy.max_active == 1
+
+        # Once the first evaluation finishes the symbol is processed again
+        strategy.release.set()
+        bot._running["AAA"].result(timeout=5)
+        bot._latest_ltp_ts = time.time()
+        bot._process_strategies()
+        assert strategy.calls == 2
+        assert strategy.max_active == 1
+        assert "AAA" not in bot._running
+    finally:
+        strategy.release.set()
+        bot._executor.shutdown(wait=True)
+
+    print("✓ Symbol skipped while its evaluation was in flight")
+
+
+def ist(hour: int, minute: int, second: int = 0, day: int = 3) -> float:
+    """Epoch seconds of a wall-clock time in IST (June 2024)"""
+    return market_hours.IST.localize(datetime(2024, 6, day, hour, minute, second)).timestamp()
+
+
+def test_candle_buckets_follow_session_open():
+    """Hourly and half-hourly buckets roll over at :15/:45 IST, with the candles"""
+    print("\n" + "=" * 60)
+    print("TEST: Candle buckets aligned to the 09:15 IST open")
+    print("=" * 60)
+
+    # 60minute candles: 09:15, 10:15, 11:15, ...
+    assert _candle_bucket(ist(10, 14, 59), "60minute") != _candle_bucket(ist(10, 15), "60minute")
+    assert _candle_bucket(ist(10, 15), "60minute") == _candle_bucket(ist(11, 14, 59), "60minute")
+    assert _candle_bucket(ist(11, 15), "60minute") == _candle_bucket(ist(10, 15), "60minute") + 1
+    assert _candle_bucket(ist(9, 15), "60minute") == _candle_bucket(ist(10, 0), "60minute")
+
+    # 30minute candles: 09:15, 09:45, 10:15, ...
+    assert _candle_bucket(ist(9, 44, 59), "30minute") != _candle_bucket(ist(9, 45), "30minute")
+    assert _candle_bucket(ist(9, 45), "30minute") == _candle_bucket(ist(10, 14, 59), "30minute")
+    assert _candle_bucket(ist(10, 15), "30minute") == _candle_bucket(ist(9, 45), "30minute") + 1
+    assert _candle_bucket(ist(10, 0), "30minute") == _candle_bucket(ist(10, 14), "30minute")
+
+    # Shorter intervals still divide the session evenly; days roll at the open
+    assert _candle_bucket(ist(9, 20), "5minute") == _candle_bucket(ist(9, 15), "5minute") + 1
+    assert _candle_bucket(ist(15, 29), "day") == _candle_bucket(ist(9, 15), "day")
+    assert _candle_bucket(ist(9, 15, day=4), "day") == _candle_bucket(ist(9, 15), "day") + 1
+
+    print("✓ Buckets change exactly at candle boundaries")
+
+
+class FakeBroker:
+    """Records orders; entries for symbols in `reject` fail"""
+
+    def __init__(self, reject=(), release=None):
+        self.reject = set(reject)
+        self.release = release  # Event each entry waits on, if given
+        self.started = threading.Event()
+        self.placed = []
+        self.modified = []
+        self._lock = threading.Lock()
+
+    def place_market_order_with_sl(self, tradingsymbol, exchange, transaction_type,
+                                   quantity, sl_price, tag=None, **kwargs):
+        self.started.set()
+        if self.release is not None:
+            self.release.wait(10)
+        with self._lock:
+            self.placed.append((tradingsymbol, transaction_type, quantity, sl_price))
+        if tradingsymbol in self.reject:
+            raise Exception("Insufficient margin")
+        return {
+            'success': True,
+            'market_order_id': f"MKT_{tradingsymbol}",
+            'sl_order_id': f"SL_{tradingsymbol}"
+        }
+
+    def modify_order(self, order_id, **kwargs):
+        with self._lock:
+            self.modified.append((order_id, kwargs))
+        return order_id
+
+
+def signal(symbol: str, signal_type: SignalType, stop_loss: float, metadata=None) -> TradingSignal:
+    """Signal for 5 shares at 100"""
+    return TradingSignal(
+        timestamp=datetime.now(),
+        symbol=symbol,
+        signal_type=signal_type,
+        price=100.0,
+        quantity=5,
+        stop_loss=stop_loss,
+        metadata=metadata
+    )
+
+
+def test_order_worker_places_basket_and_tracks_sl():
+    """Queued entries go out as a basket and their SL orders are tracked"""
+    print("\n" + "=" * 60)
+    print("TEST: Order queue -> basket placement -> SL tracking")
+    print("=" * 60)
+
+    broker = FakeBroker(reject={"CCC"})
+    bot = TradingBot()
+    bot._order_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+    seen, ordered = [], []
+    bot.on_signal(seen.append)
+    bot.on_order(ordered.append)
+
+    with mock.patch.object(order_service, "place_market_order_with_sl", broker.place_market_order_with_sl), \
+            mock.patch.object(order_service, "modify_order", broker.modify_order):
+        signals = [
+            signal("AAA", SignalType.BUY, 98.0),
+            signal("BBB", SignalType.SELL, 102.0),
+            signal("CCC", SignalType.BUY, 97.0),
+            signal("AAA", SignalType.HOLD, 99.0, metadata={**UPDATE_SL_METADATA}),
+            signal("BBB", SignalType.HOLD, 101.0),  # no update_sl action
+        ]
+        for s in signals:
+            bot._execute_signal(s)
+        bot._order_queue.put(None)  # sentinel after the signals, unlike stop()
+
+        worker = threading.Thread(target=bot._order_worker, daemon=True)
+        worker.start()
+        worker.join(timeout=10)
+        assert not worker.is_alive()
+    bot._order_executor.shutdown(wait=True)
+
+    # Every entry reached the broker, with its side and stop-loss
+    assert sorted(broker.placed) == [
+        ("AAA", "BUY", 5, 98.0), ("BBB", "SELL", 5, 102.0), ("CCC", "BUY", 5, 97.0)
+    ]
+
+    # Successful entries are positions with their SL order tracked
+    assert set(bot.active_positions) == {"AAA", "BBB"}
+    assert bot.active_positions["AAA"].quantity == 5
+    assert bot.active_positions["BBB"].quantity == -5
+    assert bot._sl_order_id == {"AAA": "SL_AAA", "BBB": "SL_BBB"}
+    assert bot.orders_placed == 2
+
+    # The update_sl HOLD moved AAA's protective order; the plain HOLD did nothing
+    assert broker.modified == [("SL_AAA", {'price': 99.0, 'trigger_price': 99.0})]
+    assert bot.active_positions["AAA"].stop_loss == 99.0
+    assert bot.active_positions["BBB"].stop_loss == 102.0
+
+    assert seen == signals and ordered == signals
+    print("✓ Basket placed, failed entry skipped, SL order tracked and updated")
+
+
+def test_place_basket_orders_keeps_order_and_isolates_failures():
+    """Results line up with the input orders; one failure doesn't sink the rest"""
+    broker = FakeBroker(reject={"BBB"})
+    orders = [
+        {'tradingsymbol': sym, 'exchange': "NSE", 'transaction_type': "BUY",
+         'quantity': 1, 'sl_price': 90.0}
+        for sym in ("AAA", "BBB", "CCC", "DDD")
+    ]
+    with mock.patch.object(order_service, "place_market_order_with_sl", broker.place_market_order_with_sl):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            results = order_service.place_basket_orders(orders, executor=executor)
+        temp_pool_results = order_service.place_basket_orders(orders)
+
+    for batch in (results, temp_pool_results):
+        assert [r['success'] for r in batch] == [True, False, True, True]
+        assert [r.get('sl_order_id') for r in batch] == ["SL_AAA", None, "SL_CCC", "SL_DDD"]
+        assert batch[1]['message'] == "Insufficient margin"
+    assert order_service.place_basket_orders([]) == []
+
+
+def test_entries_do_not_wait_on_busy_worker_pool():
+    """Orders go out while every strategy worker is stuck on a slow call"""
+    broker = FakeBroker()
+    bot = TradingBot()
+    hung = threading.Event()
+    bot._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    bot._executor.submit(hung.wait, 10)
+    bot._order_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    try:
+        with mock.patch.object(order_service, "place_market_order_with_sl", broker.place_market_order_with_sl):
+            bot._handle_signals([
+                signal("AAA", SignalType.BUY, 98.0),
+                signal("BBB", SignalType.SELL, 102.0),
+            ])
+        assert bot.orders_placed == 2
+    finally:
+        hung.set()
+        bot._executor.shutdown(wait=True)
+        bot._order_executor.shutdown(wait=True)
+
+
+def test_stop_finishes_batch_in_flight():
+    """stop() lets a batch already at the broker complete and be recorded"""
+    print("\n" + "=" * 60)
+    print("TEST: Stop during basket placement")
+    print("=" * 60)
+
+    release = threading.Event()
+    broker = FakeBroker(release=release)
+    bot = TradingBot()
+    bot.status = BotStatus.RUNNING
+    # Single-thread pools, so the second entry is still queued when stop() runs
+    bot._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    bot._order_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    bot._order_thread = threading.Thread(target=bot._order_worker, daemon=True)
+
+    with mock.patch.object(order_service, "place_market_order_with_sl", broker.place_market_order_with_sl):
+        # Both signals queued first, so the worker sends them as one basket
+        bot._execute_signal(signal("AAA", SignalType.BUY, 98.0))
+        bot._execute_signal(signal("BBB", SignalType.BUY, 98.0))
+        bot._order_thread.start()
+        assert broker.started.wait(5)
+        threading.Timer(0.3, release.set).start()
+        result = bot.stop(square_off_positions=False)
+
+    assert result["success"]
+    assert sorted(p[0] for p in broker.placed) == ["AAA", "BBB"]
+    assert bot.orders_placed == 2
+    assert bot._executor is None and bot._order_executor is None
+    print("✓ Both entries placed and recorded before shutdown")
+
+
+def test_order_queue_backpressure_and_stop():
+    """A full queue drops new signals; stopping discards unsent ones"""
+    bot = TradingBot()
+    bot._order_queue = queue.Queue(maxsize=2)
+
+    for sym in ("AAA", "BBB", "CCC"):
+        bot._execute_signal(signal(sym, SignalType.BUY, 98.0))
+    assert bot.signals_dropped == 1
+    assert [bot._order_queue.get_nowait().symbol for _ in range(2)] == ["AAA", "BBB"]
+
+    bot._execute_signal(signal("DDD", SignalType.BUY, 98.0))
+    bot._stop_order_worker()
+    assert bot._order_queue.empty()
+
+
+if __name__ == "__main__":
+    test_timed_out_strategy_is_not_resubmitted()
+    test_candle_buckets_follow_session_open()
+    test_order_worker_places_basket_and_tracks_sl()
+    test_place_basket_orders_keeps_order_and_isolates_failures()
+    test_entries_do_not_wait_on_busy_worker_pool()
+    test_stop_finishes_batch_in_flight()
+    test_order_queue_backpressure_and_stop()
@@ -0,0 +1,101 @@
+"""
+Test Indicators Against Reference Implementations
+Checks TechnicalIndicators.adx against Wilder's textbook ADX
+
+The reference below follows Wilder's original definition (as in TA-Lib):
+running sums seeded over the first `period` bars, then
+S = S - S/period + x. TechnicalIndicators.adx smooths with
+ewm(alpha=1/period, adjust=False) from the first bar instead, so the
+two agree once the different seeding has decayed away.
+"""
+import sys
+sys.path.append('.')
+
+import numpy as np
+import pandas as pd
+
+from app.services.indicators import TechnicalIndicators
+
+
+def wilder_adx(high, low, close, period=14):
+    """Reference ADX, +DI and -DI (NaN until each value is defined)"""
+    n = len(close)
+    tr = np.zeros(n)
+    plus_dm = np.zeros(n)
+    minus_dm = np.zeros(n)
+    for i in range(1, n):
+        tr[i] = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        up = high[i] - high[i - 1]
+        down = low[i - 1] - low[i]
+        plus_dm[i] = up if up > down and up > 0 else 0.0
+        minus_dm[i] = down if down > up and down > 0 else 0.0
+
+    plus_di = np.full(n, np.nan)
+    minus_di = np.full(n, np.nan)
+    dx = np.full(n, np.nan)
+    s_tr = tr[1:period + 1].sum()
+    s_plus = plus_dm[1:period + 1].sum()
+    s_minus = minus_dm[1:period + 1].sum()
+    for i in range(period, n):
+        if i > period:
+            s_tr = s_tr - s_tr / period + tr[i]
+            s_plus = s_plus - s_plus / period + plus_dm[i]
+            s_minus = s_minus - s_minus / period + minus_dm[i]
+        plus_di[i] = 100 * s_plus / s_tr
+        minus_di[i] = 100 * s_minus / s_tr
+        dx[i] = 100 * abs(plus_di[i] - minus_di[i]) / (plus_di[i] + minus_di[i])
+
+    adx = np.full(n, np.nan)
+    first = 2 * period - 1
+    adx[first] = dx[period:first + 1].mean()
+    for i in range(first + 1, n):
+        adx[i] = (adx[i - 1] * (period - 1) + dx[i]) / period
+    return adx, plus_di, minus_di
+
+
+def random_ohlc(bars: int, seed: int) -> pd.DataFrame:
+    """Random-walk OHLC bars"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, bars))
+    high = close + rng.uniform(0.1, 2.0, bars)
+    low = close - rng.uniform(0.1, 2.0, bars)
+    return pd.DataFrame(
+        {'open': close, 'high': high, 'low': low, 'close': close},
+        index=pd.date_range("2024-01-01 09:15", periods=bars, freq="5min")
+    )
+
+
+def test_adx_matches_wilder_reference():
+    """ADX, +DI and -DI converge to Wilder's values once seeding decays"""
+    print("\n" + "=" * 60)
+    print("TEST: ADX vs Wilder reference")
+    print("=" * 60)
+
+    for seed in range(5):
+        for period in (7, 14, 21):
+            df = random_ohlc(600, seed)
+            adx, plus_di, minus_di = TechnicalIndicators.adx(df, period)
+            ref_adx, ref_plus, ref_minus = wilder_adx(
+                df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), period
+            )
+
+            assert len(adx) == len(plus_di) == len(minus_di) == len(df)
+            tail = slice(-100, None)
+            np.testing.assert_allclose(plus_di.to_numpy()[tail], ref_plus[tail], rtol=1e-7)
+            np.testing.assert_allclose(minus_di.to_numpy()[tail], ref_minus[tail], rtol=1e-7)
+            np.testing.assert_allclose(adx.to_numpy()[tail], ref_adx[tail], rtol=1e-7)
+
+    print("✓ ADX, +DI and -DI match the reference on the last 100 bars")
+
+
+def test_adx_bounds():
+    """Directional indices and ADX stay within 0..100"""
+    df = random_ohlc(300, 42)
+    for series in TechnicalIndicators.adx(df):
+        values = series.to_numpy()[1:]
+        assert np.all((values >= 0) & (values <= 100))
+
+
+if __name__ == "__main__":
+    test_adx_matches_wilder_reference()
+    test_adx_bounds()
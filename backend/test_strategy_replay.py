@@ -0,0 +1,232 @@
+"""
+Test Incremental Strategy Indicators
+Replays bars tick by tick and checks each strategy's incremental indicator
+state against a full recompute over the same data
+
+Every bar arrives as a few ticks of a forming candle before it closes,
+the way the bot sees it between historical-data refreshes. The reference
+values are the whole-series pandas formulas the strategies used before
+their state became incremental.
+"""
+import os
+import sys
+from unittest import mock
+sys.path.append('.')
+
+# Fail fast when no MongoDB is reachable (paper trading connects at import)
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017/?serverSelectionTimeoutMS=500")
+
+import numpy as np
+import pandas as pd
+
+from app.services.indicators import TechnicalIndicators
+from app.strategies.base_strategy import StrategyConfig
+from app.strategies.ema_rsi_strategy import EMA_RSI_Strategy
+from app.strategies.renko_macd_strategy import RenkoMACDStrategy, RenkoMACDStrategyConfig
+from app.strategies.scalp_strategy import ScalpingStrategy
+from app.strategies.supertrend_strategy import SupertrendStrategy, SupertrendStrategyConfig
+
+BARS = 300
+TICKS_PER_BAR = 3
+WARMUP = 40
+
+
+def random_bars(bars: int, seed: int) -> pd.DataFrame:
+    """Random-walk OHLC bars"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, bars))
+    open_ = np.concatenate(([100.0], close[:-1]))
+    high = np.maximum(open_, close) + rng.uniform(0.05, 1.5, bars)
+    low = np.minimum(open_, close) - rng.uniform(0.05, 1.5, bars)
+    return pd.DataFrame(
+        {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': 1000.0},
+        index=pd.date_range("2024-01-01 09:15", periods=bars, freq="5min")
+    )
+
+
+def replay(bars: pd.DataFrame):
+    """
+    Yield the frame seen on every tick: closed bars plus a forming bar
+
+    The forming bar's close walks towards its final value over
+    TICKS_PER_BAR ticks, widening high/low as it goes.
+    """
+    for i in range(WARMUP, len(bars)):
+        final = bars.iloc[i]
+        start = bars['close'].iloc[i - 1]
+        for tick in range(1, TICKS_PER_BAR + 1):
+            close = start + (final['close'] - start) * tick / TICKS_PER_BAR
+            frame = bars.iloc[:i + 1].copy()
+            frame.iloc[-1, frame.columns.get_loc('close')] = close
+            frame.iloc[-1, frame.columns.get_loc('high')] = max(final['open'], close) + 0.1 * tick
+            frame.iloc[-1, frame.columns.get_loc('low')] = min(final['open'], close) - 0.1 * tick
+            yield frame
+
+
+# ==================== REFERENCE (FULL RECOMPUTE) ====================
+
+def reference_rsi_ema(close: pd.Series, period: int) -> pd.Series:
+    """Wilder RSI over the whole series"""
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).ewm(alpha=1/period, adjust=False).mean()
+    loss = (-delta.where(delta < 0, 0)).ewm(alpha=1/period, adjust=False).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+
+def reference_rsi_rolling(close: pd.Series, period: int) -> pd.Series:
+    """Simple-mean RSI over the whole series"""
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+
+def reference_supertrend(df: pd.DataFrame, period: int, multiplier: float) -> np.ndarray:
+    """Supertrend over the whole series (ATR as Wilder EMA of true range)"""
+    tr = pd.concat([
+        df['high'] - df['low'],
+        np.abs(df['high'] - df['close'].shift()),
+        np.abs(df['low'] - df['close'].shift()),
+    ], axis=1).max(axis=1)
+    atr = tr.ewm(alpha=1/period, adjust=False).mean().to_numpy()
+    hl_avg = ((df['high'] + df['low']) / 2).to_numpy()
+    upper = hl_avg + multiplier * atr
+    lower = hl_avg - multiplier * atr
+    close = df['close'].to_numpy()
+
+    st = np.full(len(df), np.nan)
+    uptrend = True
+    for i in range(period, len(df)):
+        if i == period:
+            st[i] = lower[i]
+        elif uptrend:
+            if close[i] <= st[i - 1]:
+                st[i], uptrend = upper[i], False
+            else:
+                st[i] = max(lower[i], st[i - 1])
+        else:
+            if close[i] >= st[i - 1]:
+                st[i], uptrend = lower[i], True
+            else:
+                st[i] = min(upper[i], st[i - 1])
+    return st
+
+
+# ==================== TESTS ====================
+
+def test_ema_rsi_state_matches_full_recompute():
+    """EMA_RSI_Strategy's EMA/RSI state tracks the whole-series values"""
+    print("\n" + "=" * 60)
+    print("TEST: EMA + RSI incremental state vs full recompute")
+    print("=" * 60)
+
+    strategy = EMA_RSI_Strategy(StrategyConfig(name="EMA RSI", symbol="TEST", params={}))
+    for frame in replay(random_bars(BARS, 1)):
+        close = frame['close']
+        ema_fast = TechnicalIndicators.ema(close, strategy.fast_ema).to_numpy()
+        ema_slow = TechnicalIndicators.ema(close, strategy.slow_ema).to_numpy()
+        rsi = reference_rsi_ema(close, strategy.rsi_period).to_numpy()
+
+        expected = (ema_fast[-2], ema_slow[-2], ema_fast[-1], ema_slow[-1], rsi[-1])
+        np.testing.assert_allclose(strategy._indicators(frame), expected, rtol=1e-9)
+
+    print("✓ EMA fast/slow and RSI match on every tick")
+
+
+def test_renko_macd_state_matches_full_recompute():
+    """RenkoMACDStrategy's MACD state and crossover track TechnicalIndicators.macd"""
+    print("\n" + "=" * 60)
+    print("TEST: Renko MACD incremental state vs full recompute")
+    print("=" * 60)
+
+    # Brick sizing fetches history from Kite; not needed for MACD
+    with mock.patch.object(RenkoMACDStrategy, "_initialize_brick_size"):
+        config = RenkoMACDStrategyConfig(symbol="TEST")
+        strategy = RenkoMACDStrategy(config)
+
+    checked = 0
+    for frame in replay(random_bars(BARS, 2)):
+        strategy.update_macd_status(frame)
+        close = frame['close']
+        macd_line, signal_line, _ = TechnicalIndicators.macd(
+            close, config.macd_fast, config.macd_slow, config.macd_signal
+        )
+        ema_fast = close.ewm(span=config.macd_fast, adjust=False).mean()
+        ema_slow = close.ewm(span=config.macd_slow, adjust=False).mean()
+
+        # Stored state is as of the last closed bar
+        np.testing.assert_allclose(
+            strategy._macd_state,
+            (ema_fast.iloc[-2], ema_slow.iloc[-2], signal_line.iloc[-2]),
+            rtol=1e-9
+        )
+
+        # Crossover as of the forming bar
+        if macd_line.iloc[-1] > signal_line.iloc[-1]:
+            assert strategy.macd_crossover == "bullish"
+        elif macd_line.iloc[-1] < signal_line.iloc[-1]:
+            assert strategy.macd_crossover == "bearish"
+        checked += 1
+
+    assert checked == (BARS - WARMUP) * TICKS_PER_BAR
+    print(f"✓ MACD state and crossover match on {checked} ticks")
+
+
+def test_supertrend_state_matches_full_recompute():
+    """SupertrendStrategy's incremental supertrends match a full recompute"""
+    print("\n" + "=" * 60)
+    print("TEST: Supertrend incremental state vs full recompute")
+    print("=" * 60)
+
+    config = SupertrendStrategyConfig(symbol="TEST")
+    strategy = SupertrendStrategy(config)
+    params = (
+        (config.st1_period, config.st1_multiplier),
+        (config.st2_period, config.st2_multiplier),
+        (config.st3_period, config.st3_multiplier),
+    )
+
+    for frame in replay(random_bars(BARS, 3)):
+        latest = strategy._update_supertrends(frame)
+        full = strategy.calculate_supertrends(frame)
+        for (period, multiplier), incremental, recomputed in zip(params, latest, full):
+            expected = reference_supertrend(frame, period, multiplier)[-2:]
+            np.testing.assert_allclose(incremental, expected, rtol=1e-9)
+            np.testing.assert_allclose(recomputed[-2:], expected, rtol=1e-9)
+
+    print("✓ All three supertrends match on every tick")
+
+
+def test_supertrend_reseeds_on_unknown_history():
+    """A frame that doesn't continue the stored bars is recomputed from scratch"""
+    config = SupertrendStrategyConfig(symbol="TEST")
+    strategy = SupertrendStrategy(config)
+    first, second = random_bars(120, 4), random_bars(120, 5)
+    second.index = second.index + pd.Timedelta(days=1)  # bars are matched by timestamp
+
+    strategy._update_supertrends(first)
+    latest = strategy._update_supertrends(second)
+    expected = reference_supertrend(second, config.st1_period, config.st1_multiplier)[-2:]
+    np.testing.assert_allclose(latest[0], expected, rtol=1e-9)
+
+
+def test_scalp_rsi_matches_full_recompute():
+    """ScalpingStrategy's rolling RSI window tracks the whole-series value"""
+    print("\n" + "=" * 60)
+    print("TEST: Scalping RSI window vs full recompute")
+    print("=" * 60)
+
+    strategy = ScalpingStrategy(StrategyConfig(name="Scalp", symbol="TEST", params={}))
+    for frame in replay(random_bars(BARS, 6)):
+        expected = reference_rsi_rolling(frame['close'], strategy.rsi_period).iloc[-1]
+        np.testing.assert_allclose(strategy._rsi(frame), expected, rtol=1e-9)
+
+    print("✓ RSI matches on every tick")
+
+
+if __name__ == "__main__":
+    test_ema_rsi_state_matches_full_recompute()
+    test_renko_macd_state_matches_full_recompute()
+    test_supertrend_state_matches_full_recompute()
+    test_supertrend_reseeds_on_unknown_history()
+    test_scalp_rsi_matches_full_recompute()
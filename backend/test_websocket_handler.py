@@ -0,0 +1,247 @@
+"""
+Test WebSocket Handler
+Covers shard assignment, resubscription, tick backpressure and reconnect
+backoff without a live Kite connection
+
+KiteTicker is replaced by StubTicker and Twisted's reactor by a manual
+clock, so every test runs offline and deterministically.
+"""
+import sys
+import queue
+from unittest import mock
+sys.path.append('.')
+
+from twisted.internet.task import Clock
+from kiteconnect import KiteTicker
+
+from app.services import websocket_handler as ws_module
+from app.services.websocket_handler import WebSocketHandler
+
+
+class StubTicker:
+    """KiteTicker stand-in recording subscriptions and connects"""
+    MODE_LTP = "ltp"
+    MODE_QUOTE = "quote"
+    MODE_FULL = "full"
+
+    def __init__(self, api_key, access_token):
+        self.connected = False
+        self.subscribed = []
+        self.modes = []
+        self.connects = 0
+
+    def is_connected(self):
+        return self.connected
+
+    def connect(self, threaded=False):
+        self.connects += 1
+
+    def subscribe(self, tokens):
+        self.subscribed.append(list(tokens))
+
+    def set_mode(self, mode, tokens):
+        self.modes.append((mode, list(tokens)))
+
+    def unsubscribe(self, tokens):
+        pass
+
+    def close(self):
+        self.connected = False
+
+
+class ManualReactor(Clock):
+    """Reactor stand-in: timers advance by hand, calls run inline"""
+    running = False
+
+    def callFromThread(self, fn, *args, **kwargs):
+        fn(*args, **kwargs)
+
+
+def patched():
+    """Patch KiteTicker, the reactor and the auth service for one test"""
+    auth = ws_module.kite_auth_service
+    reactor = ManualReactor()
+    patches = [
+        mock.patch.object(ws_module, "KiteTicker", StubTicker),
+        mock.patch.object(ws_module, "reactor", reactor),
+        mock.patch.object(auth, "is_authenticated", lambda: True),
+        mock.patch.object(auth, "api_key", "key", create=True),
+        mock.patch.object(auth, "access_token", "token", create=True),
+    ]
+    return reactor, patches
+
+
+def run_patched(test):
+    """Run test(handler, reactor) with the stubs installed"""
+    reactor, patches = patched()
+    for p in patches:
+        p.start()
+    try:
+        test(WebSocketHandler(), reactor)
+    finally:
+        for p in reversed(patches):
+            p.stop()
+
+
+def test_shard_assignment():
+    """Tokens fill a connection up to the soft limit, then spread, then cap"""
+    def run(handler, reactor):
+        handler.tokens_per_connection = 2
+        handler.max_tokens_per_connection = 3
+        handler.max_connections = 3
+
+        handler.subscribe(list(range(1, 11)))
+
+        assert [sorted(s) for s in handler.shard_tokens] == [[1, 2, 7], [3, 4, 8], [5, 6, 9]]
+        assert handler.token_to_ticker[1] == 0 and handler.token_to_ticker[9] == 2
+        assert 10 not in handler.subscribed_tokens  # every connection full
+
+        # A token already placed keeps its shard
+        handler.subscribe([4])
+        assert handler.token_to_ticker[4] == 1
+        status = handler.get_status()
+        assert status["tokens_per_connection"] == [3, 3, 3]
+        assert status["subscription_count"] == 9
+
+    run_patched(run)
+
+
+def test_resubscribe_on_connect():
+    """A connecting shard resubscribes only its own tokens, in full mode"""
+    def run(handler, reactor):
+        handler.tokens_per_connection = 2
+        handler.subscribe([11, 12, 13])  # not connected: tokens are stored
+        first = handler._create_ticker()
+        second = handler._create_ticker()
+
+        connected = []
+        handler.on_connect(connected.append)
+        handler.reconnect_attempts = 4
+        second.connected = True
+        handler._on_connect(second, "ok")
+
+        assert second.subscribed == [[13]]
+        assert second.modes == [(StubTicker.MODE_FULL, [13])]
+        assert first.subscribed == []
+        assert connected == ["ok"]
+        assert handler.is_connected and handler.reconnect_attempts == 0
+
+        # An unknown ws falls back to resubscribing every shard
+        handler._on_connect(object(), "ok")
+        assert sorted(first.subscribed[-1]) == [11, 12]
+        assert second.subscribed[-1] == [13]
+
+    run_patched(run)
+
+
+def test_kite_ticker_passes_itself_to_callbacks():
+    """_on_connect relies on KiteTicker handing itself over as ws"""
+    ticker = KiteTicker("key", "token")
+    seen = []
+    ticker.on_connect = lambda ws, response: seen.append(ws)
+    ticker.on_close = lambda ws, code, reason: seen.append(ws)
+    ticker.on_noreconnect = lambda ws: seen.append(ws)
+
+    ticker._on_connect(object(), "ok")
+    ticker._on_close(object(), 1000, "bye")
+    ticker._on_noreconnect()
+
+    assert seen == [ticker, ticker, ticker]
+
+
+def test_drop_oldest_under_backpressure():
+    """A full tick queue drops the oldest batch; the rest arrive in order"""
+    handler = WebSocketHandler()
+    handler._tick_queue = queue.Queue(maxsize=3)
+
+    for i in range(5):
+        handler._on_ticks(None, [{'instrument_token': 1, 'last_price': float(i)}])
+
+    assert handler.ticks_dropped == 2
+    assert handler.get_status()["ticks_dropped"] == 2
+
+    received = []
+    handler.on_tick(received.append)
+    handler._start_dispatcher()
+    handler._stop_dispatcher()
+
+    prices = [tick['last_price'] for batch in received for tick in batch]
+    assert prices == [2.0, 3.0, 4.0]
+    assert all(tick['timestamp'] for batch in received for tick in batch)
+
+
+def test_coalesce_keeps_latest_tick_per_instrument():
+    """With coalescing on, queued batches collapse to the newest tick each"""
+    handler = WebSocketHandler()
+    handler.coalesce_ticks = True
+    for i in range(3):
+        handler._on_ticks(None, [
+            {'instrument_token': 1, 'last_price': 100.0 + i},
+            {'instrument_token': 2, 'last_price': 200.0 + i},
+        ])
+
+    received = []
+    handler.on_tick(received.append)
+    handler._start_dispatcher()
+    handler._stop_dispatcher()
+
+    assert len(received) == 1
+    assert sorted(t['last_price'] for t in received[0]) == [102.0, 202.0]
+
+
+def test_reconnect_backoff():
+    """Reconnects start once KiteTicker gives up and back off exponentially"""
+    def run(handler, reactor):
+        handler.reconnect_delay = 5
+        handler.max_reconnect_delay = 20
+        handler.max_reconnect_attempts = 4
+        first = handler._create_ticker()
+        second = handler._create_ticker()
+
+        # A plain close is left to KiteTicker's own retries
+        handler._on_close(first, 1006, "dropped")
+        assert reactor.getDelayedCalls() == []
+
+        # Both shards giving up share one pending attempt
+        handler._on_noreconnect(first)
+        handler._on_noreconnect(second)
+        calls = reactor.getDelayedCalls()
+        assert len(calls) == 1 and calls[0].getTime() == 5
+
+        reactor.advance(5)
+        assert (first.connects, second.connects) == (1, 1)
+
+        # Later attempts double the delay up to the cap, then stop
+        delays = []
+        for _ in range(4):
+            handler._on_noreconnect(first)
+            calls = reactor.getDelayedCalls()
+            if not calls:
+                break
+            delays.append(calls[0].getTime() - reactor.seconds())
+            reactor.advance(delays[-1])
+        assert delays == [10, 20, 20]
+        assert handler.reconnect_attempts == 4
+
+        # A successful connect resets the backoff
+        first.connected = True
+        handler._on_connect(first, "ok")
+        assert handler.reconnect_attempts == 0
+
+        # disconnect() cancels a pending attempt
+        handler._on_noreconnect(second)
+        assert len(reactor.getDelayedCalls()) == 1
+        handler.disconnect()
+        assert reactor.getDelayedCalls() == []
+
+    run_patched(run)
+
+
+if __name__ == "__main__":
+    test_shard_assignment()
+    test_resubscribe_on_connect()
+    test_kite_ticker_passes_itself_to_callbacks()
+    test_drop_oldest_under_backpressure()
+    test_coalesce_keeps_latest_tick_per_instrument()
+    test_reconnect_backoff()
+    print("✓ WebSocket handler tests passed")